@@ -21,6 +21,20 @@ if db_path and not db_path.exists():
     print("Creating SQLite database...")
     initialize_database()
 
+# ------------------------------------------------------------
+# Warm embedding models (once per process, survives reruns)
+# ------------------------------------------------------------
+from smart_applier.utils.model_registry import preload_models, DEFAULT_MODELS
+from smart_applier.agents.skill_gap_agent import backend_models, interactive_backend
+
+@st.cache_resource
+def _warm_models():
+    # the pages run skill gaps with the interactive backend, so mpnet is not loaded here
+    models = dict.fromkeys([*DEFAULT_MODELS, *backend_models(interactive_backend())])
+    return preload_models(models, background=True)
+
+_warm_models()
+
 # ------------------------------------------------------------
 # Import UI pages
 # ------------------------------------------------------------
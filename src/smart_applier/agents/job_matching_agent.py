@@ -1,20 +1,43 @@
 # src/smart_applier/agents/job_matching_agent.py
 
+import os
+import time
 from pathlib import Path
 import pandas as pd
 import numpy as np
 import string
 import faiss
-from sentence_transformers import SentenceTransformer
 
 from smart_applier.utils.path_utils import get_data_dirs
-from smart_applier.utils.db_utils import insert_top_matched
+from smart_applier.utils.model_registry import get_model
+from smart_applier.utils.embedding_cache import cached_encode, get_embedding_cache
+from smart_applier.utils.job_index import get_job_index, make_faiss_index, index_kind, INDEX_TYPES
+from smart_applier.utils.db_utils import (
+    bulk_insert_top_matched,
+    fts_query,
+    get_database_identity,
+    get_profiles_by_user_ids,
+    get_scraped_job_ids,
+    get_scraped_jobs_by_ids,
+    search_jobs,
+)
 
 
 class JobMatchingAgent:
-    def __init__(self, model_name="all-MiniLM-L6-v2"):
-        # SentenceTransformer for embeddings
-        self.model = SentenceTransformer(model_name)
+    def __init__(self, model_name="all-MiniLM-L6-v2", index_type: str = None, index_params: dict = None):
+        # SentenceTransformer for embeddings (shared, loaded once per process)
+        self.model_name = model_name
+        self.model = get_model(model_name)
+        self.embedding_cache = get_embedding_cache()
+
+        # "flat" (exact), "hnsw" or "ivfpq"; knobs in job_index.DEFAULT_INDEX_PARAMS
+        self.index_type = index_type or os.getenv("JOB_INDEX_TYPE", "flat")
+        if self.index_type not in INDEX_TYPES:
+            raise ValueError(f" Unknown index_type '{self.index_type}'. Use one of {INDEX_TYPES}.")
+        self.index_params = index_params or {}
+        self.job_index = get_job_index(model_name, self.index_type, self.index_params)
+        # ids in the index must come from this DB (not a deleted / in-memory one)
+        self.job_index.bind(get_database_identity())
 
         paths = get_data_dirs()
         self.profiles_dir = paths["profiles"]
@@ -34,7 +57,7 @@ class JobMatchingAgent:
     # ---------------------------------------------------
     # USER PROFILE → VECTOR
     # ---------------------------------------------------
-    def embed_user_profile(self, profile: dict):
+    def profile_text(self, profile: dict) -> str:
         # collect skills
         skills_text = " ".join(
             " ".join(skill_list)
@@ -51,10 +74,16 @@ class JobMatchingAgent:
         achievements_text = " ".join(profile.get("achievements", []))
 
         combined = " ".join([skills_text, projects_text, achievements_text])
-        combined = self.preprocess_text(combined)
+        return self.preprocess_text(combined)
+
+    def embed_user_profile(self, profile: dict):
+        # cached by content hash; float32 guaranteed
+        return cached_encode(self.model, self.model_name, [self.profile_text(profile)], self.embedding_cache)[0]
 
-        # FIX — ensure float32
-        return self.model.encode(combined, convert_to_numpy=True).astype("float32")
+    def embed_user_profiles(self, profiles: list) -> np.ndarray:
+        """Embed many profiles with a single encode call (cache misses only)."""
+        texts = [self.profile_text(p) for p in profiles]
+        return cached_encode(self.model, self.model_name, texts, self.embedding_cache)
 
     # ---------------------------------------------------
     # JOBS TEXT → VECTOR
@@ -70,22 +99,68 @@ class JobMatchingAgent:
             )
             job_texts.append(self.preprocess_text(str(text)))
 
-        # FIX — ensure float32 embeddings
-        return self.model.encode(job_texts, convert_to_numpy=True).astype("float32")
+        # only postings we have not seen before reach the model
+        return cached_encode(self.model, self.model_name, job_texts, self.embedding_cache)
 
     # ---------------------------------------------------
     # FAISS INDEX
     # ---------------------------------------------------
-    def build_faiss_index(self, job_embeddings: np.ndarray):
+    def build_faiss_index(self, job_embeddings: np.ndarray, index_type: str = None):
         job_embeddings = job_embeddings.astype("float32")  # *** important ***
 
         d = job_embeddings.shape[1]
-        index = faiss.IndexFlatIP(d)
-
         faiss.normalize_L2(job_embeddings)
+
+        # IVF-PQ trains on (a sample of) the embeddings being indexed
+        index = make_faiss_index(index_type or self.index_type, d, self.index_params, job_embeddings)
         index.add(job_embeddings)
         return index
 
+    def recall_report(self, job_embeddings: np.ndarray, queries: np.ndarray = None,
+                      k: int = 10, n_queries: int = 200) -> dict:
+        """
+        Measure the configured index against the exact flat baseline:
+        recall@k, mean query latency (ms) and serialized index size (MB).
+        Uses a sample of the jobs themselves as queries when none are given.
+        """
+        job_embeddings = job_embeddings.astype("float32")
+        if queries is None:
+            rng = np.random.default_rng(0)
+            pick = rng.choice(len(job_embeddings), min(n_queries, len(job_embeddings)), replace=False)
+            queries = job_embeddings[pick]
+        queries = queries.astype("float32").copy()
+        faiss.normalize_L2(queries)
+        k = min(k, len(job_embeddings))
+
+        report = {}
+        results = {}
+        for kind in dict.fromkeys(["flat", self.index_type]):
+            start = time.perf_counter()
+            index = self.build_faiss_index(job_embeddings, index_type=kind)
+            build_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            _, I = index.search(queries, k)
+            query_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+            results[kind] = I
+            report[kind] = {
+                "effective_type": index_kind(index),
+                "build_seconds": round(build_s, 3),
+                "query_ms": round(query_ms, 4),
+                "size_mb": round(faiss.serialize_index(index).nbytes / (1024 * 1024), 3),
+            }
+
+        truth = results["flat"]
+        for kind, I in results.items():
+            hits = sum(len(set(a[a >= 0]) & set(b)) for a, b in zip(I, truth))
+            report[kind]["recall_at_k"] = round(hits / truth.size, 4)
+
+        report["k"] = k
+        report["n_jobs"] = len(job_embeddings)
+        report["n_queries"] = len(queries)
+        return report
+
     # ---------------------------------------------------
     # MAIN MATCHING LOGIC
     # ---------------------------------------------------
@@ -109,21 +184,172 @@ class JobMatchingAgent:
         faiss.normalize_L2(profile_vector.reshape(1, -1))
 
         index = self.build_faiss_index(job_embeddings)
-        D, I = index.search(profile_vector.reshape(1, -1), top_k)
+        D, I = index.search(profile_vector.reshape(1, -1), min(top_k, len(jobs_df)))
 
-        matched = jobs_df.iloc[I[0]].copy().reset_index(drop=True)
-        matched["match_score"] = D[0].round(4)
+        # approximate indexes may return fewer than top_k hits (-1 slots)
+        found = I[0] >= 0
+        I, D = I[0][found], D[0][found]
+
+        matched = jobs_df.iloc[I].copy().reset_index(drop=True)
+        matched["match_score"] = D.round(4)
 
         # SAVE MATCHES FOR DASHBOARD
         if "db_id" in jobs_df.columns:
-            for rank, idx in enumerate(I[0]):
-                try:
-                    db_id = int(jobs_df.iloc[idx]["db_id"])
-                    score = float(D[0][rank])
-                    insert_top_matched(job_id=db_id, user_id=user_id, score=score)
-                except Exception as e:
-                    print(" Failed to save top match:", e)
+            db_ids = [jobs_df.iloc[idx]["db_id"] for idx in I]
+            self._save_matches(db_ids, D, user_id)
         else:
             print(" WARNING: db_id column missing in jobs_df. Top matches not saved.")
 
         return matched
+
+    def _save_matches(self, db_ids, scores, user_id: str = None):
+        rows = [(int(db_id), user_id, float(score)) for db_id, score in zip(db_ids, scores)]
+        try:
+            bulk_insert_top_matched(rows)
+        except Exception as e:
+            print(" Failed to save top matches:", e)
+
+    # ---------------------------------------------------
+    # PERSISTENT JOB INDEX (whole scrape history)
+    # ---------------------------------------------------
+    def index_jobs(self, jobs_df: pd.DataFrame, job_embeddings: np.ndarray) -> int:
+        """Add (or refresh) scraped jobs (rows with a db_id) in the index; job_index.flush() saves them."""
+        if "db_id" not in jobs_df.columns or job_embeddings.shape[0] == 0:
+            return 0
+
+        mask = jobs_df["db_id"].notna().to_numpy()
+        ids = jobs_df.loc[mask, "db_id"].astype("int64").to_numpy()
+        added = self.job_index.add(ids, job_embeddings[mask])
+        if added:
+            print(f" Job index: added/updated {added} jobs (total {self.job_index.ntotal})")
+        return added
+
+    def sync_job_index(self) -> dict:
+        """
+        Reconcile the persistent index with scraped_jobs: drop ids that were
+        deleted, embed and add rows that are missing (embeddings come from cache),
+        then save it.
+        """
+        db_ids = set(get_scraped_job_ids())
+        indexed = set(self.job_index.ids().tolist())
+
+        removed = self.job_index.remove(sorted(indexed - db_ids))
+
+        missing = sorted(db_ids - indexed)
+        added = 0
+        if missing:
+            rows = get_scraped_jobs_by_ids(missing)
+            df = pd.DataFrame(rows).rename(columns={"id": "db_id"})
+            added = self.index_jobs(df, self.embed_jobs(df))
+
+        self.job_index.flush()
+        return {"added": added, "removed": removed, "total": self.job_index.ntotal}
+
+    def match_job_history(
+        self,
+        profile_vector: np.ndarray,
+        top_k=10,
+        user_id: str = None,
+        query: str = None,
+        filters: dict = None,
+        prefilter_limit: int = 500
+    ) -> pd.DataFrame:
+        """
+        One search of the profile against every job ever scraped. With a
+        keyword `query` and/or `filters` (see db_utils.search_jobs), only the
+        best `prefilter_limit` lexical hits are scored, exactly.
+        """
+        if query or filters:
+            return self._match_prefiltered(profile_vector, top_k, user_id, query, filters, prefilter_limit)
+
+        D, I = self.job_index.search(profile_vector, top_k, params=self.index_params)
+
+        pairs = [(int(j), float(d)) for j, d in zip(I[0], D[0]) if j >= 0]
+        if not pairs:
+            raise ValueError(" Job index is empty — scrape or sync jobs first.")
+
+        rows = get_scraped_jobs_by_ids([j for j, _ in pairs])
+        if not rows:
+            raise ValueError(" Job index is stale — run sync_job_index().")
+        scores = dict(pairs)
+
+        matched = pd.DataFrame(rows).rename(columns={"id": "db_id"})
+        raw = [scores[j] for j in matched["db_id"]]
+        matched["match_score"] = [round(score, 4) for score in raw]
+
+        # store the raw score (like match_jobs / match_many); round only for display
+        self._save_matches(matched["db_id"], raw, user_id)
+        return matched
+
+    def _match_prefiltered(self, profile_vector, top_k, user_id, query, filters, prefilter_limit):
+        if query and query.strip() and not fts_query(query):
+            raise ValueError(f" Query {query!r} has no searchable words — nothing to filter on.")
+        rows = search_jobs(query, filters, limit=prefilter_limit)
+        if not rows:
+            raise ValueError(f" No scraped jobs match query={query!r} filters={filters}.")
+
+        candidates = pd.DataFrame(rows).rename(columns={"id": "db_id"}).drop(columns=["rank"], errors="ignore")
+
+        # candidate embeddings come from the cache; a small exact search beats the ANN index here
+        vectors = self.embed_jobs(candidates)
+        faiss.normalize_L2(vectors)
+        query_vec = np.ascontiguousarray(profile_vector, dtype="float32").reshape(1, -1).copy()
+        faiss.normalize_L2(query_vec)
+
+        scores = vectors @ query_vec[0]
+        order = np.argsort(-scores)[:top_k]
+
+        matched = candidates.iloc[order].reset_index(drop=True)
+        matched["match_score"] = scores[order].round(4)
+
+        self._save_matches(matched["db_id"], scores[order], user_id)
+        return matched
+
+    # ---------------------------------------------------
+    # BATCHED MATCHING (many profiles, one search)
+    # ---------------------------------------------------
+    def match_many(self, user_ids: list, top_k=10, save: bool = True) -> dict:
+        """
+        Match many stored profiles against the shared job index at once:
+        one encode for all profiles, one matrix search, one DB transaction.
+        Returns {user_id: matched DataFrame}; unknown users are skipped and
+        repeated ids are matched once.
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        profiles = get_profiles_by_user_ids(user_ids)
+        found_ids = [u for u in user_ids if u in profiles]
+        missing = [u for u in user_ids if u not in profiles]
+        if missing:
+            print(f" match_many: no profile for {missing}")
+        if not found_ids:
+            return {}
+
+        if self.job_index.ntotal == 0:
+            raise ValueError(" Job index is empty — scrape or sync jobs first.")
+
+        vectors = self.embed_user_profiles([profiles[u] for u in found_ids])
+        D, I = self.job_index.search(vectors, top_k, params=self.index_params)
+
+        # fetch every matched job once
+        job_ids = sorted({int(j) for j in I.ravel() if j >= 0})
+        jobs_by_id = {row["id"]: row for row in get_scraped_jobs_by_ids(job_ids)}
+
+        results = {}
+        rows_to_save = []
+        for user_id, scores, ids in zip(found_ids, D, I):
+            records = []
+            for job_id, score in zip(ids.tolist(), scores.tolist()):
+                job = jobs_by_id.get(job_id)
+                if job is None:
+                    continue
+                record = dict(job)
+                record["db_id"] = record.pop("id")
+                record["match_score"] = round(score, 4)
+                records.append(record)
+                rows_to_save.append((job_id, user_id, float(score)))
+            results[user_id] = pd.DataFrame(records)
+
+        if save and rows_to_save:
+            bulk_insert_top_matched(rows_to_save)
+
+        return results
@@ -1,70 +1,327 @@
 # src/smart_applier/agents/job_scraper_agent.py
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Callable, Iterator, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from collections import defaultdict
+import threading
 import pandas as pd
-from bs4 import BeautifulSoup
-import requests
 import time
-from datetime import datetime
-from smart_applier.utils.db_utils import bulk_insert_scraped_jobs
+from smart_applier.utils.db_utils import bulk_insert_scraped_jobs, find_known_jobs, unique_jobs
+from smart_applier.utils.http_utils import HostRateLimiter, build_session
+from smart_applier.scrapers.sources import JobSource, KarkidiSource, get_source
 
 class JobScraperAgent:
-    def __init__(self):
+    def __init__(
+        self,
+        base_url: str = "https://www.karkidi.com/Find-Jobs/{page}/all/India",
+        max_workers: int = 4,
+        requests_per_second: float = 2.0,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 10,
+        parser_backend: Optional[str] = None,
+    ):
         self.headers = {'User-Agent': 'Mozilla/5.0'}
-        self.base_url = "https://www.karkidi.com/Find-Jobs/{page}/all/India"
+        # overridable so tests can point at a local fixture server
+        self.base_url = base_url
+        self.max_workers = max_workers
+        self.timeout = timeout
+        # None → fastest installed backend (selectolax > lxml > html.parser)
+        self.parser_backend = parser_backend
 
-    def scrape_karkidi(self, pages: int = 3) -> pd.DataFrame:
-        jobs_list: List[Dict[str, Any]] = []
+        # default adapter used when no source is passed
+        self.source = KarkidiSource(base_url, parser_backend, requests_per_second)
 
-        for page in range(1, pages + 1):
-            url = self.base_url.format(page=page)
-            print(f" Scraping page {page}: {url}")
+        # per-source request counters for scrape_sources() reports
+        self._stats = defaultdict(lambda: {"requests": 0, "errors": 0})
+        self._stats_lock = threading.Lock()
 
-            try:
-                response = requests.get(url, headers=self.headers, timeout=10)
-                if response.status_code != 200:
-                    print(f"Failed to fetch page {page}: {response.status_code}")
-                    continue
-
-                soup = BeautifulSoup(response.content, "html.parser")
-                job_blocks = soup.find_all("div", class_="ads-details")
-
-                for job in job_blocks:
-                    try:
-                        title = job.find("h4").get_text(strip=True) if job.find("h4") else ""
-                        company_tag = job.find("a", href=lambda x: x and "Employer-Profile" in x)
-                        company = company_tag.get_text(strip=True) if company_tag else "Unknown Company"
-                        location = job.find("p").get_text(strip=True) if job.find("p") else ""
-                        experience_tag = job.find("p", class_="emp-exp")
-                        experience = experience_tag.get_text(strip=True) if experience_tag else ""
-                        key_skills_tag = job.find("span", string="Key Skills")
-                        skills = key_skills_tag.find_next("p").get_text(strip=True) if key_skills_tag else ""
-                        summary_tag = job.find("span", string="Summary")
-                        summary = summary_tag.find_next("p").get_text(strip=True) if summary_tag else ""
-                        posted_tag = job.find("span", string="Posted On")
-                        posted_date = posted_tag.find_next("p").get_text(strip=True) if posted_tag else ""
-
-                        jobs_list.append({
-                            "title": title,
-                            "company": company,
-                            "location": location,
-                            "experience": experience,
-                            "skills": skills,
-                            "summary": summary,
-                            "posted_on": posted_date,
-                            "scraped_at": datetime.now().isoformat()
-                        })
-                    except Exception as e:
-                        print(f" Error parsing job block: {e}")
-                        continue
-
-                time.sleep(1)
+        self.session = build_session(
+            headers=self.headers,
+            pool_size=max_workers,
+            max_retries=max_retries,
+            backoff=backoff,
+        )
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+
+    # ---------------------------------------------------
+    # FETCHING (network only, no parsing)
+    # ---------------------------------------------------
+    def _count(self, source: JobSource, error: bool):
+        with self._stats_lock:
+            stats = self._stats[source.name]
+            stats["requests"] += 1
+            stats["errors"] += int(error)
+
+    def resolve_source(self, source: Union[str, JobSource]) -> JobSource:
+        """Registry lookup, except that this agent's own source keeps its configuration."""
+        if isinstance(source, str) and source == self.source.name:
+            return self.source
+        return get_source(source)
+
+    def fetch_page(self, page: int, source: Optional[JobSource] = None) -> Optional[bytes]:
+        source = source or self.source
+        url = source.url_for(page)
+        print(f" Scraping page {page}: {url}")
+
+        try:
+            self.rate_limiter.per_host.setdefault(source.host, source.requests_per_second)
+            self.rate_limiter.wait(url)
+            response = self.session.get(url, headers=source.headers or None, timeout=self.timeout)
+            if response.status_code != 200:
+                print(f"Failed to fetch page {page}: {response.status_code}")
+                self._count(source, error=True)
+                return None
+            self._count(source, error=False)
+            return response.content
+        except Exception as e:
+            print(f" Error fetching page {page}: {e}")
+            self._count(source, error=True)
+            return None
+
+    def fetch_pages(self, pages: int = 3, concurrent: bool = True,
+                    source: Optional[JobSource] = None) -> Dict[int, bytes]:
+        """Fetch pages 1..pages; returns {page: html bytes} for the ones that succeeded."""
+        page_numbers = list(range(1, pages + 1))
+
+        def _fetch(page):
+            return self.fetch_page(page, source)
+
+        if concurrent and self.max_workers > 1 and len(page_numbers) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scraper") as pool:
+                contents = list(pool.map(_fetch, page_numbers))
+        else:
+            contents = [_fetch(p) for p in page_numbers]
+
+        return {p: c for p, c in zip(page_numbers, contents) if c is not None}
 
+    def iter_pages(
+        self,
+        pages: int = 3,
+        concurrent: bool = True,
+        should_fetch: Optional[Callable[[int], bool]] = None,
+        source: Optional[JobSource] = None,
+        probe_first: bool = False,
+    ) -> Iterator[Tuple[int, bytes]]:
+        """
+        Yield (page, html bytes) as soon as each page arrives (completion order).
+        At most max_workers pages are in flight; `should_fetch(page)` is checked
+        right before each page is requested, so a consumer can stop pagination
+        mid-run (pages already in flight are still downloaded, then dropped).
+        With `probe_first`, page 1 is fetched and handed over alone before any
+        other request. Closing the generator early cancels queued pages.
+        """
+        page_numbers = list(range(1, pages + 1))
+        should_fetch = should_fetch or (lambda page: True)
+
+        if not (concurrent and self.max_workers > 1 and len(page_numbers) > 1):
+            for page in page_numbers:
+                content = self.fetch_page(page, source) if should_fetch(page) else None
+                if content is not None:
+                    yield page, content
+            return
+
+        if probe_first:
+            content = self.fetch_page(1, source) if should_fetch(1) else None
+            if content is not None:
+                yield 1, content
+            page_numbers = page_numbers[1:]
+
+        queue = iter(page_numbers)
+        pending = {}
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scraper")
+
+        def _submit_next() -> bool:
+            for page in queue:
+                if should_fetch(page):
+                    pending[pool.submit(self.fetch_page, page, source)] = page
+                    return True
+            return False
+
+        try:
+            for _ in range(self.max_workers):
+                if not _submit_next():
+                    break
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page = pending.pop(future)
+                    content = future.result()
+                    if content is not None and should_fetch(page):
+                        yield page, content
+                    # the consumer has handled `page` by now; refill the window
+                    _submit_next()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    # ---------------------------------------------------
+    # PARSING
+    # ---------------------------------------------------
+    def parse_page(self, content: bytes, source: Optional[JobSource] = None) -> List[Dict[str, Any]]:
+        source = source or self.source
+        return [source.normalize(record) for record in source.parse(content)]
+
+    def iter_jobs(
+        self,
+        pages: int = 3,
+        concurrent: bool = True,
+        should_fetch: Optional[Callable[[int], bool]] = None,
+        source: Optional[JobSource] = None,
+        probe_first: bool = False,
+    ) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """Yield (page, parsed job records) per page while later pages are still downloading."""
+        for page, content in self.iter_pages(pages, concurrent=concurrent, should_fetch=should_fetch,
+                                             source=source, probe_first=probe_first):
+            try:
+                yield page, self.parse_page(content, source)
             except Exception as e:
-                print(f" Error fetching page {page}: {e}")
+                print(f" Error parsing page {page}: {e}")
+
+    # ---------------------------------------------------
+    # STREAMING PIPELINE
+    # ---------------------------------------------------
+    def scrape_stream(
+        self,
+        pages: int = 3,
+        on_batch: Optional[Callable[[pd.DataFrame], None]] = None,
+        concurrent: bool = True,
+        stop_on_known_page: bool = True,
+        source: Optional[JobSource] = None,
+    ) -> pd.DataFrame:
+        """
+        Pipeline mode: each page is inserted into the DB and handed to
+        `on_batch` (e.g. embed + index) as soon as it is parsed, overlapping
+        downstream work with the remaining downloads.
+
+        Karkidi lists newest first, so with `stop_on_known_page` the first page
+        whose postings are all already stored ends pagination: page 1 is
+        probed alone, later pages are not requested (pages already in flight
+        are discarded).
+        Returns all jobs (with db_id and is_new) ordered by page; a posting
+        listed twice (same page or across pages) appears once.
+        """
+        start = time.perf_counter()
+        batches: Dict[int, pd.DataFrame] = {}
+        last_page = [pages]
+        new_total = 0
+        seen_ids = set()
+
+        def _should_fetch(page):
+            return page <= last_page[0]
+
+        source = source or self.source
+        for page, jobs in self.iter_jobs(pages, concurrent=concurrent, should_fetch=_should_fetch,
+                                         source=source, probe_first=stop_on_known_page):
+            jobs = unique_jobs(jobs)
+            if not jobs:
                 continue
 
+            known = find_known_jobs(jobs)
+            df_batch = pd.DataFrame(jobs)
+            df_batch["db_id"] = bulk_insert_scraped_jobs(jobs)
+            df_batch["is_new"] = ~df_batch["db_id"].isin(set(known.values()))
+            # already streamed from an earlier page of this run (listings shift while paging)
+            df_batch = df_batch[~df_batch["db_id"].isin(seen_ids)].reset_index(drop=True)
+            seen_ids.update(df_batch["db_id"].tolist())
+            new_total += int(df_batch["is_new"].sum())
+            if df_batch.empty:
+                continue
+            batches[page] = df_batch
+
+            if stop_on_known_page and not df_batch["is_new"].any() and page < last_page[0]:
+                print(f" [{source.name}] page {page} contains only known jobs — stopping pagination.")
+                last_page[0] = page
+
+            if on_batch is not None:
+                try:
+                    on_batch(df_batch)
+                except Exception as e:
+                    print(f" Batch handler failed for page {page}: {e}")
+
+        if not batches:
+            print(f" Scraper Agent [{source.name}]: fetched 0 jobs total")
+            return pd.DataFrame()
+
+        df_jobs = pd.concat([batches[p] for p in sorted(batches)], ignore_index=True)
+        print(f" Scraper Agent [{source.name}]: streamed {len(df_jobs)} jobs ({new_total} new) "
+              f"from {len(batches)}/{pages} pages in {time.perf_counter() - start:.2f}s")
+        return df_jobs
+
+    # ---------------------------------------------------
+    # MULTI-SOURCE COORDINATOR
+    # ---------------------------------------------------
+    def scrape_sources(
+        self,
+        sources: List[Union[str, JobSource]],
+        pages: int = 2,
+        on_batch: Optional[Callable[[pd.DataFrame], None]] = None,
+        stop_on_known_page: bool = True,
+    ) -> Tuple[pd.DataFrame, Dict[str, Dict[str, Any]]]:
+        """
+        Scrape several job boards in parallel (one stream per source, each
+        with its own page workers and per-host rate limit).
+        Returns (all jobs in scraped_jobs schema, per-source report with
+        jobs, new jobs, seconds, jobs/s, requests and error rate).
+        """
+        resolved = [self.resolve_source(s) for s in sources]
+        if not resolved:
+            return pd.DataFrame(), {}
+
+        def _run(source: JobSource):
+            with self._stats_lock:
+                self._stats.pop(source.name, None)
+            start = time.perf_counter()
+            try:
+                df = self.scrape_stream(pages, on_batch=on_batch, source=source,
+                                        stop_on_known_page=stop_on_known_page)
+                failure = None
+            except Exception as e:
+                print(f" Source '{source.name}' failed: {e}")
+                df, failure = pd.DataFrame(), str(e)
+            return source, df, time.perf_counter() - start, failure
+
+        frames, report = [], {}
+        with ThreadPoolExecutor(max_workers=len(resolved), thread_name_prefix="source") as pool:
+            for source, df, seconds, failure in pool.map(_run, resolved):
+                with self._stats_lock:
+                    counts = dict(self._stats[source.name])
+                jobs = len(df)
+                report[source.name] = {
+                    "jobs": jobs,
+                    "new_jobs": int(df["is_new"].sum()) if "is_new" in df.columns else 0,
+                    "seconds": round(seconds, 2),
+                    "jobs_per_second": round(jobs / seconds, 2) if seconds else 0.0,
+                    "requests": counts["requests"],
+                    "errors": counts["errors"],
+                    "error_rate": round(counts["errors"] / counts["requests"], 3) if counts["requests"] else 0.0,
+                    "failure": failure,
+                }
+                if not df.empty:
+                    frames.append(df)
+
+        df_all = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        return df_all, report
+
+    # ---------------------------------------------------
+    # MAIN SCRAPE
+    # ---------------------------------------------------
+    def scrape_karkidi(self, pages: int = 3, concurrent: bool = True) -> pd.DataFrame:
+        """Fetch all pages of the default source, then parse and insert in one go."""
+        start = time.perf_counter()
+        fetched = self.fetch_pages(pages, concurrent=concurrent)
+        fetch_s = time.perf_counter() - start
+
+        # parse in page order so results are deterministic
+        jobs_list: List[Dict[str, Any]] = []
+        for page in sorted(fetched):
+            try:
+                jobs_list.extend(self.parse_page(fetched[page]))
+            except Exception as e:
+                print(f" Error parsing page {page}: {e}")
+        jobs_list = unique_jobs(jobs_list)
+
         df_jobs = pd.DataFrame(jobs_list)
-        print(f" Scraper Agent: fetched {len(df_jobs)} jobs total")
+        print(f" Scraper Agent: fetched {len(df_jobs)} jobs total "
+              f"({len(fetched)}/{pages} pages in {fetch_s:.2f}s)")
 
         if df_jobs.empty:
             return df_jobs
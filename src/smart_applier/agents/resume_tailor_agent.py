@@ -3,10 +3,12 @@ import os
 import re
 import json
 from pathlib import Path
-from sentence_transformers import SentenceTransformer, util
 from dotenv import load_dotenv
 import google.generativeai as genai
 from smart_applier.utils.path_utils import get_data_dirs
+from smart_applier.utils.model_registry import get_model
+from smart_applier.utils.skill_vocab import get_skill_vocabulary
+from smart_applier.utils.skill_normalizer import canonical_skill, normalize_skills
 from smart_applier.agents.resume_builder_agent import ResumeBuilderAgent
 from smart_applier.utils.db_utils import insert_resume, get_all_scraped_jobs
 
@@ -19,7 +21,8 @@ class ResumeTailorAgent:
         genai.configure(api_key=api_key)
 
         self.gemini_model = genai.GenerativeModel("models/gemini-2.0-flash-lite")
-        self.model = SentenceTransformer(model_name)
+        self.model = get_model(model_name)
+        self.skill_vocab = get_skill_vocabulary(model_name)
 
     def clean_job_description(self, job_description: str):
         prompt = f"""
@@ -39,14 +42,21 @@ class ResumeTailorAgent:
         if not jd_keywords or not user_skills:
             return []
 
-        jd_vecs = self.model.encode(jd_keywords, convert_to_tensor=True)
-        user_vecs = self.model.encode(user_skills, convert_to_tensor=True)
-        cosine = util.cos_sim(jd_vecs, user_vecs)
-
-        matched = set()
-        for i, jd_skill in enumerate(jd_keywords):
-            if cosine[i].max().item() >= threshold:
-                matched.add(jd_skill.lower())
+        # exact / alias matches first ("ML" == "machine learning"), no model needed
+        user_canonical = normalize_skills(user_skills)
+        known = set(user_canonical)
+        matched = {k.lower() for k in jd_keywords if canonical_skill(k) in known}
+
+        rest = [k for k in jd_keywords if k.lower() not in matched]
+        if rest and user_canonical:
+            # unit vectors from the shared skill vocabulary (encoded only once ever)
+            jd_vecs = self.skill_vocab.vectors([canonical_skill(k) for k in rest], self.model)
+            user_vecs = self.skill_vocab.vectors(user_canonical, self.model)
+            best = (jd_vecs @ user_vecs.T).max(axis=1)
+
+            for jd_skill, score in zip(rest, best):
+                if score >= threshold:
+                    matched.add(jd_skill.lower())
 
         return list(matched)
 
@@ -1,11 +1,53 @@
 # smart_applier/agents/skill_gap_agent.py
 import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
-from collections import defaultdict
-from sentence_transformers import SentenceTransformer, util
 from dotenv import load_dotenv
 import google.generativeai as genai
 from smart_applier.utils.path_utils import get_data_dirs, ensure_database_exists
+from smart_applier.utils.model_registry import get_model
+from smart_applier.utils.skill_vocab import get_skill_vocabulary
+from smart_applier.utils.llm_cache import get_response_cache
+from smart_applier.utils.local_llm import LocalGenerativeModel, LOCAL_MODEL_NAME
+from smart_applier.utils.http_utils import HostRateLimiter
+from smart_applier.utils.skill_normalizer import (
+    canonical_skill, lexical_similarity, normalize_skills, split_skills,
+)
+
+# backend → (embedding model, default "covered" threshold)
+#   mpnet    most accurate, ~420 MB model; nightly / batch runs
+#   minilm   the model JobMatchingAgent already holds in memory
+#   lexical  aliases + fuzzy string matching, no model at all
+SKILL_GAP_BACKENDS = {
+    "mpnet": ("paraphrase-mpnet-base-v2", 0.5),
+    "minilm": ("all-MiniLM-L6-v2", 0.5),
+    "lexical": (None, 0.75),
+}
+
+
+def default_backend() -> str:
+    return os.getenv("SKILL_GAP_BACKEND", "mpnet")
+
+
+def interactive_backend() -> str:
+    """Backend for runs a user waits on (Streamlit pages, custom JD)."""
+    return os.getenv("SKILL_GAP_INTERACTIVE_BACKEND", "minilm")
+
+
+def backend_models(*backends: str) -> list:
+    """Embedding models the given backends load (lexical needs none)."""
+    names = (SKILL_GAP_BACKENDS.get(b, (None,))[0] for b in backends)
+    return [name for name in dict.fromkeys(names) if name]
+
+
+# learning-resource lookups: bounded fan-out, paced per model across all agents
+# (the offline stand-in is not paced)
+LLM_MAX_WORKERS = int(os.getenv("LLM_MAX_WORKERS", 4))
+_llm_rate_limiter = HostRateLimiter(
+    float(os.getenv("LLM_REQUESTS_PER_SECOND", 2)),
+    per_host={LOCAL_MODEL_NAME: 0},
+)
 
 
 class SkillGapAgent:
@@ -14,15 +56,19 @@ class SkillGapAgent:
     (session-safe, Streamlit Cloud compatible).
     """
 
-    def __init__(self, profile: dict, jobs_df: pd.DataFrame):
+    def __init__(self, profile: dict, jobs_df: pd.DataFrame, backend: str = None):
         # -------------------------
         # Environment setup
         # -------------------------
         load_dotenv()
         self.api_key = os.getenv("GEMINI_API_KEY")
-        self.use_gemini = bool(self.api_key)
+        # LLM_BACKEND=local swaps Gemini for a deterministic offline stand-in
+        self.use_local_llm = os.getenv("LLM_BACKEND", "gemini").lower() == "local"
+        self.use_gemini = bool(self.api_key) and not self.use_local_llm
 
-        if self.use_gemini:
+        if self.use_local_llm:
+            self.model_name = LOCAL_MODEL_NAME
+        elif self.use_gemini:
             try:
                 genai.configure(api_key=self.api_key)
                 self.model_name = "gemini-2.0-flash-lite"
@@ -31,6 +77,8 @@ class SkillGapAgent:
                 self.use_gemini = False
         else:
             print(" GEMINI_API_KEY not found — skipping Gemini suggestions.")
+        self.response_cache = get_response_cache()
+        self.llm_max_workers = LLM_MAX_WORKERS
 
         # -------------------------
         # Load profile & jobs
@@ -46,93 +94,145 @@ class SkillGapAgent:
         # -------------------------
         # Load user skills
         # -------------------------
-        self.user_skills = [
-            s.lower().strip()
+        # canonical names: "ML", "Machine-Learning." -> "machine learning"
+        self.user_skills = normalize_skills(
+            s
             for subcat, skills in self.profile.get("skills", {}).items()
             for s in skills if s.strip()
-        ]
+        )
+        self.user_skill_set = set(self.user_skills)
         if not self.user_skills:
             raise ValueError(" Profile contains no valid skills.")
 
         print(f" Loaded user skills: {len(self.user_skills)} items")
 
         # -------------------------
-        # Initialize semantic model
+        # Initialize similarity backend
         # -------------------------
-        print("Loading 'paraphrase-mpnet-base-v2' for semantic analysis...")
-        self.model = SentenceTransformer("paraphrase-mpnet-base-v2")
-        self.user_embeddings = self.model.encode(self.user_skills, convert_to_tensor=True)
+        self.backend = backend or default_backend()
+        if self.backend not in SKILL_GAP_BACKENDS:
+            raise ValueError(
+                f" Unknown skill-gap backend '{self.backend}'. "
+                f"Choose from: {', '.join(SKILL_GAP_BACKENDS)}"
+            )
+        self.skill_model_name, self.threshold = SKILL_GAP_BACKENDS[self.backend]
+
+        self.model = self.skill_vocab = self.user_embeddings = None
+        if self.skill_model_name:
+            self.model = get_model(self.skill_model_name)
+            # persistent phrase → vector store: known skills need no inference
+            self.skill_vocab = get_skill_vocabulary(self.skill_model_name)
+            # unit vectors, so a dot product is the cosine similarity
+            self.user_embeddings = self.encode_skills(self.user_skills)
 
     # -------------------------
     # Skill gap detection
     # -------------------------
-    def find_missing_skills(self, job_skills, threshold=0.5):
+    def encode_skills(self, skills) -> np.ndarray:
+        return self.skill_vocab.vectors(skills, self.model)
+
+    def max_similarity(self, skills) -> np.ndarray:
+        """
+        Best similarity of each skill to any user skill: cosine (one encode,
+        one matmul) for model backends, fuzzy string ratio for "lexical".
+        """
+        if len(skills) == 0:
+            return np.zeros(0, dtype="float32")
+        if self.model is None:
+            return np.array([
+                max(lexical_similarity(skill, user_skill) for user_skill in self.user_skills)
+                for skill in skills
+            ], dtype="float32")
+        return (self.encode_skills(skills) @ self.user_embeddings.T).max(axis=1)
+
+    def coverage_scores(self, skills) -> np.ndarray:
+        """
+        Like max_similarity, but skills the user has exactly or by alias
+        (same canonical skill) score 1.0 without touching the model.
+        """
+        canonical = [canonical_skill(s) for s in skills]
+        scores = np.ones(len(canonical), dtype="float32")
+        semantic = [i for i, c in enumerate(canonical) if c not in self.user_skill_set]
+        if semantic:
+            scores[semantic] = self.max_similarity([canonical[i] for i in semantic])
+        return scores
+
+    @staticmethod
+    def split_skills(text) -> list:
+        return split_skills(text)
+
+    def find_missing_skills(self, job_skills, threshold=None):
         """Find job skills not semantically covered by user skills."""
         if not job_skills:
             return []
-        job_embeddings = self.model.encode(job_skills, convert_to_tensor=True)
-        cosine_scores = util.cos_sim(job_embeddings, self.user_embeddings)
-        missing = []
-        for i, job_skill in enumerate(job_skills):
-            similarity = cosine_scores[i].max().item()
-            if similarity < threshold:
-                missing.append((job_skill, round(similarity, 3)))
-        return missing
-
-    def get_top_missing_skills(self, top_n=5):
-        """Collect and rank missing skills across all provided jobs."""
-        all_missing_skills = defaultdict(list)
+        if threshold is None:
+            threshold = self.threshold
+        scores = self.coverage_scores(job_skills)
+        return [
+            (skill, round(float(score), 3))
+            for skill, score in zip(job_skills, scores)
+            if score < threshold
+        ]
+
+    def get_top_missing_skills(self, top_n=5, threshold=None):
+        """
+        Collect and rank missing skills across all provided jobs.
+
+        Batched: job skills are mapped to canonical names, exact/alias hits
+        are settled by lookup, and the remaining distinct skills are encoded
+        once and compared to the user's skills in one similarity matrix. A
+        skill's frequency is how often it appears across jobs. Ranked by
+        frequency, then lowest similarity. `threshold` defaults to the
+        backend's own (cosine and fuzzy scores live on different scales).
+        """
+        if threshold is None:
+            threshold = self.threshold
         valid_columns = [col for col in self.jobs_df.columns if "skill" in col.lower()]
         if not valid_columns:
             raise ValueError(" No skill-related column found in job data.")
         skill_col = valid_columns[0]
 
-        for _, job in self.jobs_df.iterrows():
-            job_skills_text = str(job.get(skill_col, "")).strip()
-            if not job_skills_text:
-                continue
-
-            job_skills = [
-                s.lower().strip()
-                for s in job_skills_text.split(",")
-                if s.strip()
-            ]
-            if not job_skills:
-                continue
+        occurrences = [
+            skill
+            for text in self.jobs_df[skill_col].fillna("").astype(str)
+            for skill in self.split_skills(text)
+        ]
+        if not occurrences:
+            return []
 
-            missing_with_conf = self.find_missing_skills(job_skills)
-            for skill, score in missing_with_conf:
-                all_missing_skills[skill].append(score)
+        # distinct skills in first-seen order (keeps ties stable)
+        position = {}
+        for skill in occurrences:
+            position.setdefault(skill, len(position))
+        unique = list(position)
+        counts = np.bincount([position[s] for s in occurrences], minlength=len(unique))
 
-        if not all_missing_skills:
+        scores = self.coverage_scores(unique)
+        missing = np.flatnonzero(scores < threshold)
+        if missing.size == 0:
             return []
 
-        skill_scores = {
-            skill: (len(scores), sum(scores) / len(scores))
-            for skill, scores in all_missing_skills.items()
-        }
-        ranked = sorted(skill_scores.items(), key=lambda x: (-x[1][0], x[1][1]))[:top_n]
-        top_missing = [skill for skill, _ in ranked]
+        order = np.lexsort((scores[missing], -counts[missing]))[:top_n]
+        top_missing = [unique[i] for i in missing[order]]
         return top_missing
 
     # -------------------------
     # Learning Recommendations
     # -------------------------
-    def get_learning_resources(self, skill, n_resources=3):
-        """Fetch learning recommendations using Gemini (if available)."""
-        if not self.use_gemini:
-            # Simple fallback
-            return [
-                f"Search 'free {skill} course' on Coursera or YouTube.",
-                f"Check Kaggle Learn for {skill} tutorials.",
-            ]
+    def _generative_model(self):
+        if self.use_local_llm:
+            return LocalGenerativeModel(self.model_name, latency=float(os.getenv("LOCAL_LLM_LATENCY", 0)))
+        return genai.GenerativeModel(self.model_name)
+
+    def _fetch_learning_resources(self, skill, n_resources=3):
+        """One LLM round trip (rate-limited); [] on failure."""
         try:
             prompt = (
                 f"List {n_resources} free, credible online learning resources "
                 f"for the skill '{skill}'. Include URLs if available."
             )
-            model = genai.GenerativeModel(self.model_name)
-            response = model.generate_content(prompt)
+            _llm_rate_limiter.wait(f"llm://{self.model_name}")
+            response = self._generative_model().generate_content(prompt)
             text = getattr(response, "text", str(response)).strip()
             return [
                 line.strip("-• ").strip()
@@ -143,10 +243,46 @@ class SkillGapAgent:
             print(f" Gemini resource fetch failed for '{skill}': {e}")
             return []
 
+    def get_learning_resources(self, skill, n_resources=3):
+        """Fetch learning recommendations using Gemini (if available), through the response cache."""
+        return self.get_learning_resources_many([skill], n_resources)[skill]
+
+    def get_learning_resources_many(self, skills, n_resources=3):
+        """
+        Resources for several skills: cached answers (keyed by model, canonical
+        skill, n_resources, with a TTL) are returned directly; misses are
+        fetched concurrently, once per canonical skill, on at most
+        `llm_max_workers` threads and cached.
+        """
+        skills = list(dict.fromkeys(skills))
+        if not self.use_gemini and not self.use_local_llm:
+            # Simple fallback
+            return {
+                skill: [
+                    f"Search 'free {skill} course' on Coursera or YouTube.",
+                    f"Check Kaggle Learn for {skill} tutorials.",
+                ]
+                for skill in skills
+            }
+
+        # "ML" and "machine learning" share one cache entry and one prompt
+        canonical = {skill: canonical_skill(skill) or skill for skill in skills}
+        keys = list(dict.fromkeys((name, n_resources) for name in canonical.values()))
+        found = self.response_cache.get_many(self.model_name, keys)
+
+        missing = [name for name, _ in keys if (name, n_resources) not in found]
+        if missing:
+            workers = max(1, min(self.llm_max_workers, len(missing)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm") as pool:
+                fetched = list(pool.map(lambda name: self._fetch_learning_resources(name, n_resources), missing))
+            fresh = {(name, n_resources): resources for name, resources in zip(missing, fetched)}
+            found.update(fresh)
+            # failures come back empty and are retried next time
+            self.response_cache.put_many(self.model_name, {k: r for k, r in fresh.items() if r})
+
+        return {skill: found[(canonical[skill], n_resources)] for skill in skills}
+
     def get_recommendations(self, top_n=5):
         """Return dictionary of missing skills + resources."""
         top_missing = self.get_top_missing_skills(top_n=top_n)
-        recommendations = {}
-        for skill in top_missing:
-            recommendations[skill] = self.get_learning_resources(skill)
-        return recommendations
+        return self.get_learning_resources_many(top_missing)
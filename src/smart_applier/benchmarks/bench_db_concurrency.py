@@ -0,0 +1,161 @@
+# src/smart_applier/benchmarks/bench_db_concurrency.py
+"""Concurrency benchmark: dashboard readers vs one writer, rollback journal vs WAL."""
+import argparse
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from smart_applier.database.connection import ConnectionManager
+from smart_applier.database.db_setup import sqlite_pragmas
+
+# pragma overrides per mode; "rollback" is SQLite's out-of-the-box behaviour
+MODES = {
+    "rollback": {"journal_mode": "DELETE", "synchronous": "FULL"},
+    "wal": {},
+}
+
+READ_QUERIES = (
+    """
+    SELECT t.id, t.job_id, t.user_id, t.score, s.title, s.company, s.location
+    FROM top_matched_jobs t LEFT JOIN scraped_jobs s ON s.id = t.job_id
+    ORDER BY t.id DESC LIMIT 50
+    """,
+    "SELECT COUNT(*) AS n FROM scraped_jobs",
+    "SELECT user_id, COUNT(*) AS n FROM top_matched_jobs GROUP BY user_id",
+)
+
+
+def _job_row(i: int) -> tuple:
+    return (
+        f"Data Engineer {i}", f"Company {i % 97}", "Bangalore", "2-5 Years",
+        "python, sql, airflow", "Build pipelines " * 20, "2025-01-01",
+        "bench", f"bench-{i}-{random.random()}",
+    )
+
+
+def _write_batch(manager: ConnectionManager, start: int, size: int):
+    with manager.transaction(immediate=True) as conn:
+        cur = conn.cursor()
+        ids = []
+        for i in range(start, start + size):
+            cur.execute("""
+                INSERT INTO scraped_jobs (title, company, location, experience, skills, summary, posted_on, source, fingerprint)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                RETURNING id
+            """, _job_row(i))
+            ids.append(cur.fetchone()["id"])
+        cur.executemany(
+            "INSERT INTO top_matched_jobs (job_id, user_id, score) VALUES (?, ?, ?)",
+            [(job_id, f"user_{job_id % 10}", random.random()) for job_id in ids],
+        )
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"n": 0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive") if len(samples) > 1 else samples * 99
+    return {
+        "n": len(samples),
+        "p50": round(cuts[49] * 1000, 2),
+        "p95": round(cuts[94] * 1000, 2),
+        "p99": round(cuts[98] * 1000, 2),
+        "max": round(max(samples) * 1000, 2),
+    }
+
+
+def run(mode: str, readers: int, seconds: float, batch: int, seed_jobs: int,
+        busy_timeout: int = None) -> Dict[str, dict]:
+    overrides = dict(MODES[mode])
+    if busy_timeout is not None:
+        overrides["busy_timeout"] = busy_timeout
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = ConnectionManager(Path(tmp) / "bench.db", pragmas=sqlite_pragmas(overrides))
+        _write_batch(manager, 0, seed_jobs)
+
+        latencies = {"read": [], "write": []}
+        errors = {"read": 0, "write": 0}
+        lock = threading.Lock()
+        stop = threading.Event()
+
+        def record(role: str, elapsed: float = None, failed: bool = False):
+            with lock:
+                if failed:
+                    errors[role] += 1
+                else:
+                    latencies[role].append(elapsed)
+
+        def reader():
+            conn = manager.connection()
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    for sql in READ_QUERIES:
+                        conn.execute(sql).fetchall()
+                    record("read", time.perf_counter() - start)
+                except sqlite3.OperationalError:
+                    record("read", failed=True)
+            manager.close()
+
+        def writer():
+            next_id = seed_jobs
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    _write_batch(manager, next_id, batch)
+                    record("write", time.perf_counter() - start)
+                    next_id += batch
+                except sqlite3.OperationalError:
+                    record("write", failed=True)
+            manager.close()
+
+        threads = [threading.Thread(target=reader) for _ in range(readers)]
+        threads.append(threading.Thread(target=writer))
+        for t in threads:
+            t.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+        manager.close()
+
+    report = {}
+    for role in ("read", "write"):
+        stats = _percentiles(latencies[role])
+        stats["ops_per_second"] = round(stats["n"] / seconds, 1)
+        stats["locked_errors"] = errors[role]
+        report[role] = stats
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--batch", type=int, default=50, help="jobs per write transaction")
+    parser.add_argument("--seed-jobs", type=int, default=2000)
+    parser.add_argument("--modes", default="rollback,wal", help=f"comma-separated, from {sorted(MODES)}")
+    parser.add_argument("--busy-timeout", type=int, default=None, help="override busy_timeout (ms)")
+    args = parser.parse_args()
+
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    unknown = [m for m in modes if m not in MODES]
+    if unknown:
+        parser.error(f"unknown mode(s) {unknown}; choose from {sorted(MODES)}")
+
+    print(f" {args.readers} readers + 1 writer, {args.seconds}s per mode, {args.batch} jobs per write")
+    for mode in modes:
+        report = run(mode, args.readers, args.seconds, args.batch, args.seed_jobs, args.busy_timeout)
+        print(f"\n  [{mode}]")
+        for role, s in report.items():
+            print(f"   {role:<5} {s['ops_per_second']:>8} ops/s  p50 {s['p50']:>7} ms  p95 {s['p95']:>7} ms"
+                  f"  p99 {s['p99']:>7} ms  max {s['max']:>7} ms  locked {s['locked_errors']}")
+
+
+if __name__ == "__main__":
+    main()
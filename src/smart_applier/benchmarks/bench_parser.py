@@ -0,0 +1,112 @@
+# src/smart_applier/benchmarks/bench_parser.py
+"""Karkidi parser throughput per backend, against the original BeautifulSoup parser."""
+import argparse
+import time
+from pathlib import Path
+from typing import List
+
+from bs4 import BeautifulSoup
+
+from smart_applier.utils.path_utils import get_data_dirs
+from smart_applier.scrapers.karkidi_parser import parse_karkidi_page, available_backends
+
+FIELDS = ("title", "company", "location", "experience", "skills", "summary", "posted_on")
+
+
+def legacy_parse(content) -> List[dict]:
+    """The pre-parser-module implementation: full tree, repeated find() per field."""
+    soup = BeautifulSoup(content, "html.parser")
+    jobs = []
+    for job in soup.find_all("div", class_="ads-details"):
+        title = job.find("h4").get_text(strip=True) if job.find("h4") else ""
+        company_tag = job.find("a", href=lambda x: x and "Employer-Profile" in x)
+        company = company_tag.get_text(strip=True) if company_tag else "Unknown Company"
+        location = job.find("p").get_text(strip=True) if job.find("p") else ""
+        experience_tag = job.find("p", class_="emp-exp")
+        experience = experience_tag.get_text(strip=True) if experience_tag else ""
+        key_skills_tag = job.find("span", string="Key Skills")
+        skills = key_skills_tag.find_next("p").get_text(strip=True) if key_skills_tag else ""
+        summary_tag = job.find("span", string="Summary")
+        summary = summary_tag.find_next("p").get_text(strip=True) if summary_tag else ""
+        posted_tag = job.find("span", string="Posted On")
+        posted_date = posted_tag.find_next("p").get_text(strip=True) if posted_tag else ""
+        jobs.append({
+            "title": title, "company": company, "location": location,
+            "experience": experience, "skills": skills, "summary": summary,
+            "posted_on": posted_date,
+        })
+    return jobs
+
+
+def fetch_pages(count: int, out_dir: Path) -> List[Path]:
+    from smart_applier.agents.job_scraper_agent import JobScraperAgent
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    scraper = JobScraperAgent()
+    saved = []
+    for page, content in sorted(scraper.fetch_pages(count).items()):
+        path = out_dir / f"karkidi_page_{page}.html"
+        path.write_bytes(content)
+        saved.append(path)
+    print(f" Saved {len(saved)} pages to {out_dir}")
+    return saved
+
+
+def run(pages: List[bytes], repeat: int) -> dict:
+    parsers = {"legacy (html.parser, full tree)": legacy_parse}
+    for backend in available_backends():
+        parsers[backend] = lambda c, b=backend: parse_karkidi_page(c, backend=b)
+
+    reference = [j for page in pages for j in legacy_parse(page)]
+    results = {}
+
+    for name, parse in parsers.items():
+        parsed = [j for page in pages for j in parse(page)]
+        agree = sum(
+            all(a.get(f) == b.get(f) for f in FIELDS)
+            for a, b in zip(parsed, reference)
+        )
+
+        start = time.perf_counter()
+        n_jobs = 0
+        for _ in range(repeat):
+            for page in pages:
+                n_jobs += len(parse(page))
+        elapsed = time.perf_counter() - start
+
+        results[name] = {
+            "jobs_per_second": round(n_jobs / elapsed, 1) if elapsed else float("inf"),
+            "ms_per_page": round(elapsed * 1000 / (repeat * len(pages)), 3),
+            "agreement": f"{agree}/{len(reference)}",
+        }
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pages", nargs="*", type=Path, help="saved Karkidi HTML pages")
+    parser.add_argument("--dir", type=Path, default=None, help="directory of saved pages (*.html)")
+    parser.add_argument("--fetch", type=int, default=0, help="download N live pages into --dir first")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    page_dir = args.dir or (get_data_dirs()["jobs"] / "pages")
+    paths = list(args.pages)
+    if args.fetch:
+        paths += fetch_pages(args.fetch, page_dir)
+    if not paths:
+        paths = sorted(page_dir.glob("*.html"))
+    if not paths:
+        parser.error(f"no pages given and none saved in {page_dir} (try --fetch 3)")
+
+    pages = [p.read_bytes() for p in paths]
+    print(f" Benchmarking {len(pages)} pages × {args.repeat} repeats")
+
+    for name, stats in run(pages, args.repeat).items():
+        print(f"  {name:<32} {stats['jobs_per_second']:>10} jobs/s"
+              f"  {stats['ms_per_page']:>8} ms/page  agree {stats['agreement']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# src/smart_applier/benchmarks/bench_skill_gap.py
+"""Skill-gap backends (mpnet / minilm / lexical): latency and agreement with a reference."""
+import argparse
+import statistics
+import time
+from typing import Dict, List
+
+import pandas as pd
+
+from smart_applier.agents.skill_gap_agent import SkillGapAgent, SKILL_GAP_BACKENDS
+from smart_applier.utils.db_utils import get_all_scraped_jobs, get_profile, list_profiles
+
+SAMPLE_PROFILE = {
+    "skills": {
+        "technical": ["Python", "SQL", "ML", "Pandas", "PowerBI", "Git"],
+        "soft": ["Communication", "Problem-solving"],
+    }
+}
+SAMPLE_SKILLS = [
+    "python, machine learning, deep learning, tensorflow, docker",
+    "sql, power bi, excel, data visualization, tableau",
+    "nlp, large language models, pytorch, aws, kubernetes",
+    "javascript, react, node.js, rest api, git",
+    "data analysis, statistics, pandas, numpy, communication",
+    "spark, hadoop, airflow, etl pipelines, gcp",
+]
+
+
+def _load_inputs(user_id: str, jobs: int):
+    profile = get_profile(user_id) if user_id else None
+    if profile is None and not user_id:
+        rows = list_profiles()
+        profile = get_profile(rows[0]["user_id"]) if rows else None
+    if not profile or not profile.get("skills"):
+        print(" No stored profile found — using the built-in sample profile.")
+        profile = SAMPLE_PROFILE
+
+    rows = get_all_scraped_jobs(limit=jobs)
+    if not rows:
+        print(" No scraped jobs found — using the built-in sample jobs.")
+        rows = [{"skills": s} for s in SAMPLE_SKILLS]
+    return profile, pd.DataFrame(rows)
+
+
+def _ms(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(q * len(values)))] * 1000, 2)
+
+
+def run(backend: str, profile: dict, df: pd.DataFrame, top_n: int) -> Dict:
+    start = time.perf_counter()
+    agent = SkillGapAgent(profile, df, backend=backend)
+    setup = time.perf_counter() - start
+
+    per_job, missing = [], []
+    for text in df["skills"].fillna("").astype(str):
+        skills = agent.split_skills(text)
+        start = time.perf_counter()
+        missing.append({skill for skill, _ in agent.find_missing_skills(skills)})
+        per_job.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    top = agent.get_top_missing_skills(top_n=top_n)
+    top_seconds = time.perf_counter() - start
+
+    return {
+        "setup_s": round(setup, 2),
+        "job_p50_ms": _ms(per_job, 0.50),
+        "job_p95_ms": _ms(per_job, 0.95),
+        "top_ms": round(top_seconds * 1000, 2),
+        "missing": missing,
+        "top": top,
+    }
+
+
+def agreement(result: Dict, reference: Dict) -> Dict[str, float]:
+    """Micro-averaged precision / recall of missing skills and top-N overlap vs the reference."""
+    hits = sum(len(a & b) for a, b in zip(result["missing"], reference["missing"]))
+    flagged = sum(len(a) for a in result["missing"])
+    expected = sum(len(b) for b in reference["missing"])
+    top_ref = set(reference["top"])
+    return {
+        "precision": round(hits / flagged, 3) if flagged else 1.0,
+        "recall": round(hits / expected, 3) if expected else 1.0,
+        "top_overlap": round(len(set(result["top"]) & top_ref) / len(top_ref), 3) if top_ref else 1.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user-id", default="")
+    parser.add_argument("--jobs", type=int, default=200, help="latest scraped jobs to compare against")
+    parser.add_argument("--top-n", type=int, default=5)
+    parser.add_argument("--backends", default=",".join(SKILL_GAP_BACKENDS),
+                        help=f"comma-separated, from {sorted(SKILL_GAP_BACKENDS)}")
+    parser.add_argument("--reference", default="mpnet", help="backend the others are scored against")
+    args = parser.parse_args()
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    unknown = [b for b in backends + [args.reference] if b not in SKILL_GAP_BACKENDS]
+    if unknown:
+        parser.error(f"unknown backend(s) {unknown}; choose from {sorted(SKILL_GAP_BACKENDS)}")
+    if args.reference not in backends:
+        backends.insert(0, args.reference)
+
+    profile, df = _load_inputs(args.user_id, args.jobs)
+    print(f" {len(df)} jobs, reference backend '{args.reference}'")
+
+    results = {backend: run(backend, profile, df, args.top_n) for backend in backends}
+    reference = results[args.reference]
+
+    print(f"\n  {'backend':<8} {'setup s':>8} {'job p50':>9} {'job p95':>9} {'top-N':>9}"
+          f" {'prec':>6} {'recall':>6} {'top∩':>6}")
+    for backend, r in results.items():
+        a = agreement(r, reference)
+        print(f"  {backend:<8} {r['setup_s']:>8} {r['job_p50_ms']:>6} ms {r['job_p95_ms']:>6} ms"
+              f" {r['top_ms']:>6} ms {a['precision']:>6} {a['recall']:>6} {a['top_overlap']:>6}")
+    print()
+    for backend, r in results.items():
+        print(f"  {backend:<8} top {args.top_n}: {', '.join(r['top']) or '-'}")
+    print(f"\n  mean missing per job: " + "  ".join(
+        f"{b} {statistics.mean(len(m) for m in r['missing']):.2f}" for b, r in results.items()
+    ))
+
+
+if __name__ == "__main__":
+    main()
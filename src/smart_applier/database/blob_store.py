@@ -0,0 +1,55 @@
+# src/smart_applier/database/blob_store.py
+"""Content-addressed, optionally zlib-compressed resume PDFs (resume_blobs table)."""
+import os
+import zlib
+import hashlib
+from typing import Iterable, Iterator, Optional, Tuple
+
+CODECS = ("raw", "zlib")
+
+
+def default_codec() -> str:
+    codec = os.getenv("RESUME_BLOB_CODEC", "zlib").lower()
+    return codec if codec in CODECS else "raw"
+
+
+def blob_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def encode_blob(data: bytes, codec: Optional[str] = None) -> Tuple[str, str, bytes]:
+    """(hash, codec actually used, payload) for `data`."""
+    codec = codec or default_codec()
+    if codec == "zlib":
+        packed = zlib.compress(data, 6)
+        if len(packed) < len(data):
+            return blob_hash(data), "zlib", packed
+    return blob_hash(data), "raw", data
+
+
+def decode_chunks(chunks: Iterable[bytes], codec: str) -> Iterator[bytes]:
+    """Decode a stream of stored chunks without holding the whole payload."""
+    if codec == "raw":
+        yield from chunks
+        return
+    if codec != "zlib":
+        raise ValueError(f" Unknown resume blob codec '{codec}'")
+
+    inflater = zlib.decompressobj()
+    for chunk in chunks:
+        out = inflater.decompress(chunk)
+        if out:
+            yield out
+    tail = inflater.flush()
+    if tail:
+        yield tail
+
+
+def store_blob(conn, data: bytes, codec: Optional[str] = None) -> str:
+    """Insert `data` unless an identical blob exists; returns its hash."""
+    digest, codec, payload = encode_blob(data, codec)
+    conn.execute("""
+        INSERT OR IGNORE INTO resume_blobs (hash, codec, size, stored_size, data)
+        VALUES (?, ?, ?, ?, ?)
+    """, (digest, codec, len(data), len(payload), payload))
+    return digest
@@ -0,0 +1,178 @@
+# src/smart_applier/database/connection.py
+import os
+import atexit
+import sqlite3
+import itertools
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+from smart_applier.utils.path_utils import get_data_dirs
+from smart_applier.database.db_setup import initialize_database, apply_pragmas, sqlite_pragmas
+
+
+_memory_names = itertools.count(1)
+
+
+def dict_factory(cursor, row):
+    return {col[0]: row[idx] for idx, col in enumerate(cursor.description)}
+
+
+class ConnectionManager:
+    """
+    One SQLite connection per thread (autocommit, tuned pragmas) for a DB file,
+    or for a shared in-memory "memdb" database when `db_path` is None.
+    """
+
+    def __init__(self, db_path: Optional[Path], pragmas: Optional[Dict[str, object]] = None):
+        self.db_path = Path(db_path) if db_path is not None else None
+        self.in_memory = self.db_path is None
+        self.pragmas = sqlite_pragmas() if pragmas is None else dict(pragmas)
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+        self._anchor = None
+        if self.in_memory:
+            self.database = f"file:/smart_applier_{next(_memory_names)}?vfs=memdb"
+            self._anchor = self.connect()
+        else:
+            self.database = str(self.db_path)
+
+    def connect(self) -> sqlite3.Connection:
+        """A new standalone connection to this manager's DB (caller closes it)."""
+        conn = sqlite3.connect(self.database, uri=self.in_memory,
+                               isolation_level=None, check_same_thread=False)
+        conn.row_factory = dict_factory
+        apply_pragmas(conn, self.pragmas)
+        return conn
+
+    def _open(self) -> sqlite3.Connection:
+        conn = self.connect()
+
+        if not self._schema_ready:
+            with self._schema_lock:
+                if not self._schema_ready:
+                    # migrations are versioned; older DB files pick up new columns/indexes
+                    initialize_database(conn)
+                    self._schema_ready = True
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._open()
+            self._local.depth = 0
+        return conn
+
+    @contextmanager
+    def transaction(self, immediate: bool = False):
+        """
+        Group statements into one transaction; nested calls join the outer one.
+        `immediate=True` takes the write lock up front (no upgrade deadlocks).
+        """
+        conn = self.connection()
+        if self._local.depth == 0 and not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            owner = True
+        else:
+            owner = False
+
+        self._local.depth += 1
+        try:
+            yield conn
+        except BaseException:
+            self._local.depth -= 1
+            if owner:
+                conn.rollback()
+            raise
+        else:
+            self._local.depth -= 1
+            if owner:
+                conn.commit()
+
+    def close(self):
+        """Close the calling thread's connection (other threads keep theirs)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def dispose(self):
+        """close(), and for in-memory DBs drop the anchor (the data goes once all threads close)."""
+        self.close()
+        if self._anchor is not None:
+            self._anchor.close()
+            self._anchor = None
+
+    # -----------------------------
+    # Snapshots (backup API)
+    # -----------------------------
+    def snapshot(self, path: Path) -> Path:
+        """Copy the live DB to `path` with the online backup API (consistent, non-blocking)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        dest = sqlite3.connect(path)
+        try:
+            self.connection().backup(dest)
+        finally:
+            dest.close()
+        print(f" DB snapshot written to: {path}")
+        return path
+
+    def restore(self, path: Path):
+        """Replace this DB's contents with the snapshot at `path`."""
+        src = sqlite3.connect(Path(path))
+        try:
+            src.backup(self.connection())
+        finally:
+            src.close()
+        self._schema_ready = False
+        self.close()  # reopen so the restored schema is migrated if it is older
+        print(f" DB restored from snapshot: {path}")
+
+
+# -----------------------------
+# Process-wide default manager
+# -----------------------------
+_manager: Optional[ConnectionManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_manager() -> ConnectionManager:
+    """
+    The process-wide manager. With USE_IN_MEMORY_DB=1 it is a shared
+    in-memory DB; set IN_MEMORY_DB_SNAPSHOT=<file> to load that file at
+    start (if it exists) and write it back at process exit.
+    """
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                manager = ConnectionManager(get_data_dirs()["db_path"])
+                if manager.in_memory:
+                    _setup_memory_snapshot(manager)
+                _manager = manager
+    return _manager
+
+
+def _setup_memory_snapshot(manager: ConnectionManager):
+    snapshot = os.getenv("IN_MEMORY_DB_SNAPSHOT")
+    if not snapshot:
+        print(" Using shared in-memory DB (data is lost at exit).")
+        return
+
+    snapshot = Path(snapshot)
+    if snapshot.exists():
+        manager.restore(snapshot)
+    atexit.register(manager.snapshot, snapshot)
+
+
+def reset_manager():
+    """Forget the default manager (e.g. after changing the data dir in tests)."""
+    global _manager
+    with _manager_lock:
+        if _manager is not None:
+            _manager.dispose()
+        _manager = None
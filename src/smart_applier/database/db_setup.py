@@ -1,8 +1,76 @@
 # src/smart_applier/database/db_setup.py
+import os
+import re
 import sqlite3
+import hashlib
 from pathlib import Path
 from smart_applier.utils.path_utils import get_data_dirs
 
+FINGERPRINT_FIELDS = ("title", "company", "location", "skills", "summary")
+
+# Connection tuning, applied to every connection we open. Each value can be
+# overridden with SQLITE_<NAME>, e.g. SQLITE_JOURNAL_MODE=DELETE or SQLITE_CACHE_SIZE=-64000.
+DEFAULT_PRAGMAS = {
+    "busy_timeout": 5000,      # ms to wait for a lock instead of "database is locked"
+    "journal_mode": "WAL",     # readers never block the writer (and vice versa)
+    "synchronous": "NORMAL",   # safe with WAL; fsync at checkpoints, not every commit
+    "cache_size": -20000,      # negative = KiB, i.e. ~20 MB page cache per connection
+    "temp_store": "MEMORY",
+}
+
+
+# Set once, on a brand-new (empty) DB file, before anything else touches it.
+# An existing DB keeps its mode until an explicit retention.vacuum(full=True).
+CREATION_PRAGMAS = {
+    "auto_vacuum": "INCREMENTAL",  # lets retention return free pages without a full VACUUM
+}
+
+
+def _env_pragmas(defaults: dict, overrides: dict = None) -> dict:
+    pragmas = dict(defaults)
+    for name in defaults:
+        value = os.getenv(f"SQLITE_{name.upper()}")
+        if value:
+            pragmas[name] = value
+    if overrides:
+        pragmas.update(overrides)
+    return pragmas
+
+
+def sqlite_pragmas(overrides: dict = None) -> dict:
+    """DEFAULT_PRAGMAS + SQLITE_* environment overrides + explicit `overrides`."""
+    return _env_pragmas(DEFAULT_PRAGMAS, overrides)
+
+
+def _set_pragmas(conn: sqlite3.Connection, pragmas: dict):
+    for name, value in pragmas.items():
+        if not re.fullmatch(r"-?\w+", str(value)):
+            raise ValueError(f"Invalid value for PRAGMA {name}: {value!r}")
+        # in-memory DBs silently keep journal_mode=memory
+        conn.execute(f"PRAGMA {name}={value}")
+
+
+def apply_pragmas(conn: sqlite3.Connection, pragmas: dict = None):
+    cur = conn.cursor()
+    cur.row_factory = None
+    if cur.execute("PRAGMA page_count").fetchone()[0] == 0:
+        # must precede journal_mode=WAL, which already writes the first page
+        _set_pragmas(conn, _env_pragmas(CREATION_PRAGMAS))
+    _set_pragmas(conn, sqlite_pragmas() if pragmas is None else pragmas)
+
+
+def job_fingerprint(job: dict) -> str:
+    """
+    Stable identity of a posting: case/whitespace-insensitive hash of
+    title, company, location, skills and summary.
+    """
+    parts = []
+    for field in FINGERPRINT_FIELDS:
+        value = job.get(field) or job.get(field.title()) or ""
+        parts.append(" ".join(str(value).lower().split()))
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
 def get_db_path() -> Path:
     paths = get_data_dirs()
     db_path = paths["db_path"]
@@ -14,63 +82,11 @@ def get_db_path() -> Path:
     return db_path
 
 def create_tables(conn: sqlite3.Connection):
-    cur = conn.cursor()
+    """Bring the schema up to date (see database/migrations.py)."""
+    # imported here: migrations.py needs job_fingerprint from this module
+    from smart_applier.database.migrations import migrate
+    migrate(conn)
 
-    # Profiles - store full profile JSON
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS profiles (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id TEXT UNIQUE,
-        name TEXT,
-        email TEXT,
-        phone TEXT,
-        location TEXT,
-        linkedin TEXT,
-        github TEXT,
-        data_json TEXT,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-
-    # Raw scraped jobs
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS scraped_jobs (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        title TEXT,
-        company TEXT,
-        location TEXT,
-        experience TEXT,
-        skills TEXT,
-        summary TEXT,
-        posted_on TEXT,
-        scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-
-    # Top matched jobs: separate table (references scraped_jobs.id)
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS top_matched_jobs (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        job_id INTEGER,
-        user_id TEXT,
-        score REAL,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-
-    # Resumes - PDF stored as BLOB
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS resumes (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id TEXT,
-        resume_type TEXT,
-        file_name TEXT,
-        pdf_blob BLOB,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-
-    conn.commit()
 
 def initialize_database(conn: sqlite3.Connection = None):
     """
@@ -81,10 +97,15 @@ def initialize_database(conn: sqlite3.Connection = None):
     if conn is None:
         db_path = get_db_path()
         conn = sqlite3.connect(db_path)
+        apply_pragmas(conn)  # journal_mode=WAL is persisted in the DB file
         created_here = True
 
     create_tables(conn)
 
+    cur = conn.cursor()
+    cur.row_factory = None
+    location = cur.execute("PRAGMA database_list").fetchone()[2] or ":memory:"
+
     if created_here:
         conn.close()
-    print(f"Database initialized at: {get_db_path()}")
+    print(f"Database initialized at: {location}")
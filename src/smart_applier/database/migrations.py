@@ -0,0 +1,310 @@
+# src/smart_applier/database/migrations.py
+"""Versioned schema migrations: register with @migration(version, name), never edit a shipped one."""
+import sqlite3
+from typing import Callable, List, Tuple
+
+from smart_applier.database.db_setup import FINGERPRINT_FIELDS, job_fingerprint
+from smart_applier.database.blob_store import store_blob
+
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = []
+
+
+def migration(version: int, name: str):
+    def register(func: Callable[[sqlite3.Connection], None]):
+        if any(v == version for v, _, _ in MIGRATIONS):
+            raise ValueError(f" Duplicate migration version {version}")
+        MIGRATIONS.append((version, name, func))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return func
+    return register
+
+
+# -----------------------------
+# Helpers
+# -----------------------------
+def add_column_if_missing(conn: sqlite3.Connection, table: str, column: str, decl: str):
+    cur = conn.cursor()
+    cur.row_factory = None
+    columns = [row[1] for row in cur.execute(f"PRAGMA table_info({table})").fetchall()]
+    if column not in columns:
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
+def ensure_job_fingerprints(conn: sqlite3.Connection):
+    """
+    Add the fingerprint column to older DBs, backfill it and enforce uniqueness.
+    Pre-existing duplicates keep a NULL fingerprint (NULLs never collide).
+    """
+    add_column_if_missing(conn, "scraped_jobs", "fingerprint", "TEXT")
+
+    cur = conn.cursor()
+    cur.row_factory = None  # plain tuples, whatever the connection uses
+
+    rows = cur.execute("""
+        SELECT id, title, company, location, skills, summary
+        FROM scraped_jobs WHERE fingerprint IS NULL ORDER BY id
+    """).fetchall()
+    if rows:
+        taken = {r[0] for r in cur.execute(
+            "SELECT fingerprint FROM scraped_jobs WHERE fingerprint IS NOT NULL"
+        ).fetchall()}
+        updates = []
+        for job_id, *values in rows:
+            fp = job_fingerprint(dict(zip(FINGERPRINT_FIELDS, values)))
+            if fp not in taken:
+                taken.add(fp)
+                updates.append((fp, job_id))
+        cur.executemany("UPDATE scraped_jobs SET fingerprint=? WHERE id=?", updates)
+
+    cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_scraped_jobs_fingerprint ON scraped_jobs(fingerprint)")
+
+
+# -----------------------------
+# Migrations
+# -----------------------------
+@migration(1, "baseline tables")
+def _baseline(conn: sqlite3.Connection):
+    # IF NOT EXISTS / column checks: DBs created before versioning already have these
+    cur = conn.cursor()
+
+    # Profiles - store full profile JSON
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS profiles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id TEXT UNIQUE,
+        name TEXT,
+        email TEXT,
+        phone TEXT,
+        location TEXT,
+        linkedin TEXT,
+        github TEXT,
+        data_json TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+    # Raw scraped jobs
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS scraped_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT,
+        company TEXT,
+        location TEXT,
+        experience TEXT,
+        skills TEXT,
+        summary TEXT,
+        posted_on TEXT,
+        source TEXT,
+        fingerprint TEXT,
+        scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+    add_column_if_missing(conn, "scraped_jobs", "source", "TEXT")
+    ensure_job_fingerprints(conn)
+
+    # Top matched jobs: separate table (references scraped_jobs.id)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS top_matched_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_id INTEGER,
+        user_id TEXT,
+        score REAL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+    # Resumes - PDF stored as BLOB
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS resumes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id TEXT,
+        resume_type TEXT,
+        file_name TEXT,
+        pdf_blob BLOB,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+
+@migration(2, "secondary indexes for joins and dashboard listings")
+def _secondary_indexes(conn: sqlite3.Connection):
+    cur = conn.cursor()
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_top_matched_job_id ON top_matched_jobs(job_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_top_matched_user_id ON top_matched_jobs(user_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_resumes_user_type ON resumes(user_id, resume_type)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_profiles_created_at ON profiles(created_at)")
+
+
+@migration(3, "content-addressed resume blobs")
+def _resume_blob_store(conn: sqlite3.Connection):
+    cur = conn.cursor()
+    cur.row_factory = None
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS resume_blobs (
+        hash TEXT PRIMARY KEY,
+        codec TEXT NOT NULL,
+        size INTEGER,
+        stored_size INTEGER,
+        data BLOB
+    )
+    """)
+    add_column_if_missing(conn, "resumes", "blob_hash", "TEXT")
+
+    # move inline PDFs one row at a time (bounded memory), deduplicating as we go
+    ids = [r[0] for r in cur.execute("SELECT id FROM resumes WHERE pdf_blob IS NOT NULL").fetchall()]
+    for resume_id in ids:
+        data = cur.execute("SELECT pdf_blob FROM resumes WHERE id=?", (resume_id,)).fetchone()[0]
+        digest = store_blob(conn, bytes(data))
+        cur.execute("UPDATE resumes SET blob_hash=?, pdf_blob=NULL WHERE id=?", (digest, resume_id))
+    if ids:
+        print(f" Moved {len(ids)} resume PDFs into resume_blobs")
+
+    cur.execute("ALTER TABLE resumes DROP COLUMN pdf_blob")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_resumes_blob_hash ON resumes(blob_hash)")
+
+    # reference counting: a blob goes away with the last resume that points at it
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_resumes_release_blob
+    AFTER DELETE ON resumes
+    WHEN OLD.blob_hash IS NOT NULL
+    BEGIN
+        DELETE FROM resume_blobs
+        WHERE hash = OLD.blob_hash
+          AND NOT EXISTS (SELECT 1 FROM resumes WHERE blob_hash = OLD.blob_hash);
+    END
+    """)
+
+
+@migration(4, "full-text index over scraped jobs")
+def _scraped_jobs_fts(conn: sqlite3.Connection):
+    cur = conn.cursor()
+    # external-content FTS5 table: stores only the index, text stays in scraped_jobs
+    cur.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS scraped_jobs_fts USING fts5(
+        title, company, location, skills, summary,
+        content='scraped_jobs', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """)
+
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_scraped_jobs_fts_insert AFTER INSERT ON scraped_jobs BEGIN
+        INSERT INTO scraped_jobs_fts (rowid, title, company, location, skills, summary)
+        VALUES (NEW.id, NEW.title, NEW.company, NEW.location, NEW.skills, NEW.summary);
+    END
+    """)
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_scraped_jobs_fts_delete AFTER DELETE ON scraped_jobs BEGIN
+        INSERT INTO scraped_jobs_fts (scraped_jobs_fts, rowid, title, company, location, skills, summary)
+        VALUES ('delete', OLD.id, OLD.title, OLD.company, OLD.location, OLD.skills, OLD.summary);
+    END
+    """)
+    # upserts only touch posted_on/scraped_at, which are not indexed
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_scraped_jobs_fts_update
+    AFTER UPDATE OF title, company, location, skills, summary ON scraped_jobs BEGIN
+        INSERT INTO scraped_jobs_fts (scraped_jobs_fts, rowid, title, company, location, skills, summary)
+        VALUES ('delete', OLD.id, OLD.title, OLD.company, OLD.location, OLD.skills, OLD.summary);
+        INSERT INTO scraped_jobs_fts (rowid, title, company, location, skills, summary)
+        VALUES (NEW.id, NEW.title, NEW.company, NEW.location, NEW.skills, NEW.summary);
+    END
+    """)
+
+    # index the rows scraped before this migration
+    cur.execute("INSERT INTO scraped_jobs_fts (scraped_jobs_fts) VALUES ('rebuild')")
+
+
+@migration(5, "retention support: time indexes, match cascade, maintenance log")
+def _retention_support(conn: sqlite3.Connection):
+    cur = conn.cursor()
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_scraped_jobs_scraped_at ON scraped_jobs(scraped_at)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_top_matched_created_at ON top_matched_jobs(created_at)")
+
+    # matches never outlive their job, however the job is deleted
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_scraped_jobs_delete_matches
+    AFTER DELETE ON scraped_jobs
+    BEGIN
+        DELETE FROM top_matched_jobs WHERE job_id = OLD.id;
+    END
+    """)
+    cur.execute("""
+        DELETE FROM top_matched_jobs
+        WHERE job_id IS NULL OR job_id NOT IN (SELECT id FROM scraped_jobs)
+    """)
+
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS maintenance_runs (
+        task TEXT PRIMARY KEY,
+        last_run TIMESTAMP
+    )
+    """)
+
+
+@migration(6, "database instance id")
+def _instance_id(conn: sqlite3.Connection):
+    # random per database file: derived data (e.g. the FAISS job index) records
+    # it, so ids from a deleted / recreated / in-memory DB are never mixed up
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS db_meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )
+    """)
+    conn.execute("INSERT OR IGNORE INTO db_meta (key, value) VALUES ('instance_id', lower(hex(randomblob(16))))")
+
+
+# -----------------------------
+# Runner
+# -----------------------------
+def _ensure_version_table(conn: sqlite3.Connection):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        name TEXT,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    cur = conn.cursor()
+    cur.row_factory = None
+    _ensure_version_table(conn)
+    return cur.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations").fetchone()[0]
+
+
+def pending_migrations(conn: sqlite3.Connection) -> List[Tuple[int, str]]:
+    current = schema_version(conn)
+    return [(v, name) for v, name, _ in MIGRATIONS if v > current]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Apply pending migrations atomically and return the resulting version.
+    Takes the write lock up front (or a savepoint inside an open transaction)
+    and re-reads the version, so concurrent starters never double-apply.
+    """
+    if not pending_migrations(conn):
+        return schema_version(conn)
+
+    nested = conn.in_transaction
+    conn.execute("SAVEPOINT migrate" if nested else "BEGIN IMMEDIATE")
+    try:
+        current = schema_version(conn)
+        for version, name, func in MIGRATIONS:
+            if version <= current:
+                continue
+            func(conn)
+            conn.execute("INSERT INTO schema_migrations (version, name) VALUES (?, ?)", (version, name))
+            print(f" Applied migration {version}: {name}")
+            current = version
+    except BaseException:
+        if nested:
+            conn.execute("ROLLBACK TO migrate")
+            conn.execute("RELEASE migrate")
+        else:
+            conn.execute("ROLLBACK")
+        raise
+    conn.execute("RELEASE migrate" if nested else "COMMIT")
+    return current
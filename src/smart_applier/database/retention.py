@@ -0,0 +1,243 @@
+# src/smart_applier/database/retention.py
+"""Retention policy (RETENTION_<TABLE>_<KEY> overrides), batched pruning, archiving and vacuum."""
+import os
+import gzip
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from smart_applier.utils.path_utils import get_data_dirs
+from smart_applier.database.connection import get_manager
+
+RETENTION_POLICY: Dict[str, Dict[str, object]] = {
+    "scraped_jobs": {"time_column": "scraped_at", "max_age_days": 90, "max_rows": 50000, "archive": True},
+    "top_matched_jobs": {"time_column": "created_at", "max_age_days": 60, "max_rows": 200000, "archive": False},
+}
+BATCH_SIZE = 500
+DEFAULT_INTERVAL_HOURS = 24
+
+
+def retention_policy(overrides: Optional[Dict[str, dict]] = None) -> Dict[str, dict]:
+    policy = {table: dict(rules) for table, rules in RETENTION_POLICY.items()}
+    for table, rules in policy.items():
+        for key in ("max_age_days", "max_rows"):
+            value = os.getenv(f"RETENTION_{table.upper()}_{key.upper()}")
+            if value:
+                rules[key] = int(value)
+    for table, rules in (overrides or {}).items():
+        policy.setdefault(table, {}).update(rules)
+    return policy
+
+
+def archive_dir() -> Path:
+    path = get_data_dirs()["root"] / "archive"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+# -----------------------------
+# Pruning
+# -----------------------------
+def _expired_ids(conn, table: str, rules: dict, limit: int) -> List[int]:
+    clauses, params = [], []
+    if rules.get("max_age_days"):
+        clauses.append(f"{rules['time_column']} < datetime('now', ?)")
+        params.append(f"-{int(rules['max_age_days'])} days")
+    if rules.get("max_rows"):
+        # ids only grow, so everything at or below the (max_rows+1)-th newest id is excess
+        clauses.append(f"id <= COALESCE((SELECT id FROM {table} ORDER BY id DESC LIMIT 1 OFFSET ?), 0)")
+        params.append(int(rules["max_rows"]))
+    if not clauses:
+        return []
+
+    rows = conn.execute(
+        f"SELECT id FROM {table} WHERE {' OR '.join(clauses)} ORDER BY id LIMIT ?",
+        (*params, limit),
+    ).fetchall()
+    return [row["id"] for row in rows]
+
+
+def _archive_rows(conn, table: str, ids: List[int], archive_file: Path):
+    marks = ",".join("?" * len(ids))
+    rows = conn.execute(f"SELECT * FROM {table} WHERE id IN ({marks}) ORDER BY id", ids).fetchall()
+    with gzip.open(archive_file, "at", encoding="utf-8") as fh:
+        for row in rows:
+            fh.write(json.dumps(row, default=str) + "\n")
+
+
+def prune_table(table: str, rules: dict, batch_size: int = BATCH_SIZE, pause: float = 0.0,
+                on_delete: Optional[Callable[[str, List[int]], None]] = None) -> dict:
+    """
+    Delete (and optionally archive) expired rows of one table, batch by batch.
+    `on_delete(table, ids)` runs after each committed batch.
+    """
+    manager = get_manager()
+    archive_file = None
+    if rules.get("archive"):
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        archive_file = archive_dir() / f"{table}_{stamp}.jsonl.gz"
+
+    deleted = 0
+    while True:
+        with manager.transaction(immediate=True) as conn:
+            ids = _expired_ids(conn, table, rules, batch_size)
+            if not ids:
+                break
+            if archive_file is not None:
+                _archive_rows(conn, table, ids, archive_file)
+            marks = ",".join("?" * len(ids))
+            conn.execute(f"DELETE FROM {table} WHERE id IN ({marks})", ids)
+        deleted += len(ids)
+        if on_delete is not None:
+            on_delete(table, ids)
+        if pause:
+            time.sleep(pause)  # let waiting readers/writers in between batches
+
+    report = {"deleted": deleted}
+    if deleted and archive_file is not None:
+        report["archive"] = str(archive_file)
+    return report
+
+
+def prune_orphan_matches(batch_size: int = BATCH_SIZE) -> int:
+    """Matches whose job no longer exists (e.g. rows deleted before the cascade trigger)."""
+    manager = get_manager()
+    deleted = 0
+    while True:
+        with manager.transaction(immediate=True) as conn:
+            cur = conn.execute("""
+                DELETE FROM top_matched_jobs WHERE id IN (
+                    SELECT t.id FROM top_matched_jobs t
+                    LEFT JOIN scraped_jobs s ON s.id = t.job_id
+                    WHERE s.id IS NULL
+                    LIMIT ?
+                )
+            """, (batch_size,))
+        deleted += cur.rowcount
+        if cur.rowcount < batch_size:
+            return deleted
+
+
+def clear_table(table: str, batch_size: int = 5000) -> int:
+    """Empty a table in batches instead of one long `DELETE FROM` lock."""
+    manager = get_manager()
+    deleted = 0
+    while True:
+        with manager.transaction(immediate=True) as conn:
+            cur = conn.execute(
+                f"DELETE FROM {table} WHERE rowid IN (SELECT rowid FROM {table} LIMIT ?)", (batch_size,)
+            )
+        deleted += cur.rowcount
+        if cur.rowcount < batch_size:
+            return deleted
+
+
+# -----------------------------
+# Space reclamation
+# -----------------------------
+def vacuum(full: bool = False, pages: int = 0) -> dict:
+    """
+    Return free pages to the OS with incremental vacuum (new DBs use
+    auto_vacuum=INCREMENTAL). Older files are left alone unless full=True:
+    a full VACUUM rewrites the whole file under an exclusive lock, and
+    converts it to incremental mode on the way.
+    """
+    conn = get_manager().connection()
+    before = _page_stats(conn)
+    if full:
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("VACUUM")
+        mode = "full"
+    elif before["auto_vacuum"] != 2:
+        print(" DB is not in auto_vacuum=INCREMENTAL mode; run vacuum(full=True) once to convert it.")
+        mode = "skipped"
+    else:
+        # the pragma frees one page per step, so it must be run to completion
+        cur = conn.cursor()
+        cur.row_factory = None
+        cur.execute(f"PRAGMA incremental_vacuum({int(pages)})" if pages else "PRAGMA incremental_vacuum").fetchall()
+        mode = "incremental"
+    conn.execute("PRAGMA optimize")
+    after = _page_stats(conn)
+    return {"mode": mode, "size_mb_before": before["size_mb"], "size_mb_after": after["size_mb"]}
+
+
+def _page_stats(conn) -> dict:
+    cur = conn.cursor()
+    cur.row_factory = None
+
+    def pragma(name):
+        return cur.execute(f"PRAGMA {name}").fetchone()[0]
+
+    page_size, page_count = pragma("page_size"), pragma("page_count")
+    return {
+        "auto_vacuum": pragma("auto_vacuum"),
+        "free_pages": pragma("freelist_count"),
+        "size_mb": round(page_size * page_count / (1024 * 1024), 2),
+    }
+
+
+# -----------------------------
+# Scheduling
+# -----------------------------
+def _last_run(conn, task: str) -> Optional[float]:
+    row = conn.execute(
+        "SELECT (julianday('now') - julianday(last_run)) * 24 AS hours FROM maintenance_runs WHERE task=?",
+        (task,),
+    ).fetchone()
+    return row["hours"] if row else None
+
+
+def maintenance_due(interval_hours: Optional[float] = None) -> bool:
+    if interval_hours is None:
+        interval_hours = float(os.getenv("RETENTION_INTERVAL_HOURS", DEFAULT_INTERVAL_HOURS))
+    hours = _last_run(get_manager().connection(), "retention")
+    return hours is None or hours >= interval_hours
+
+
+def run_maintenance(force: bool = False, policy: Optional[Dict[str, dict]] = None,
+                    batch_size: int = BATCH_SIZE,
+                    on_delete: Optional[Callable[[str, List[int]], None]] = None) -> Optional[dict]:
+    """Apply the retention policy, sweep orphans and vacuum - at most once per interval."""
+    if not force and not maintenance_due():
+        return None
+
+    manager = get_manager()
+    with manager.transaction(immediate=True) as conn:
+        # claim the run first so concurrent sessions don't all start pruning
+        if not force and not maintenance_due():
+            return None
+        conn.execute("""
+            INSERT INTO maintenance_runs (task, last_run) VALUES ('retention', CURRENT_TIMESTAMP)
+            ON CONFLICT(task) DO UPDATE SET last_run = CURRENT_TIMESTAMP
+        """)
+
+    start = time.perf_counter()
+    report = {}
+    for table, rules in retention_policy(policy).items():
+        report[table] = prune_table(table, rules, batch_size, on_delete=on_delete)
+    report["orphan_matches"] = prune_orphan_matches(batch_size)
+    report["vacuum"] = vacuum()
+    report["seconds"] = round(time.perf_counter() - start, 2)
+
+    print(f" Retention: {report}")
+    return report
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Apply the retention policy and vacuum the DB.")
+    parser.add_argument("--force", action="store_true", help="run even if the interval has not passed")
+    parser.add_argument("--full", action="store_true", help="full VACUUM (rewrites the file, exclusive lock)")
+    args = parser.parse_args()
+
+    run_maintenance(force=args.force)
+    if args.full:
+        print(f" Vacuum: {vacuum(full=True)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,11 @@ import numpy as np
 from smart_applier.agents.profile_agent import UserProfileAgent
 from smart_applier.agents.job_scraper_agent import JobScraperAgent
 from smart_applier.agents.job_matching_agent import JobMatchingAgent
-from smart_applier.agents.skill_gap_agent import SkillGapAgent
+from smart_applier.agents.skill_gap_agent import SkillGapAgent, default_backend, interactive_backend
 from smart_applier.agents.resume_tailor_agent import ResumeTailorAgent
 from smart_applier.agents.resume_builder_agent import ResumeBuilderAgent
+from smart_applier.database.retention import run_maintenance
+from smart_applier.utils.db_utils import count_scraped_jobs
 
 
 # ======================================================
@@ -22,8 +24,17 @@ def load_profile_node(state):
 
 def scrape_jobs_node(state):
     scraper = JobScraperAgent()
-    df = scraper.scrape_karkidi(pages=2)
-    return {"scraped_jobs": df.to_dict(orient="records")}
+    matcher = JobMatchingAgent()
+
+    # embed + index each page while the next ones download;
+    # embed_jobs_node then only hits the embedding cache
+    def _embed_batch(df_batch):
+        matcher.index_jobs(df_batch, matcher.embed_jobs(df_batch))
+
+    sources = state.get("sources") or ["karkidi"]
+    df, report = scraper.scrape_sources(sources, pages=state.get("pages", 2), on_batch=_embed_batch)
+    matcher.job_index.flush()
+    return {"scraped_jobs": df.to_dict(orient="records"), "scrape_report": report}
 
 
 def embed_profile_node(state):
@@ -38,6 +49,27 @@ def embed_jobs_node(state):
     df = pd.DataFrame(state["scraped_jobs"])
     vecs = matcher.embed_jobs(df)
     vecs = np.array(vecs, dtype="float32")
+
+    # keep the persistent job index up to date with this scrape
+    # (retention runs at most once per interval and drops pruned jobs from the index)
+    def _unindex(table, ids):
+        if table == "scraped_jobs":
+            matcher.job_index.remove(ids)
+
+    try:
+        run_maintenance(on_delete=_unindex)
+    except Exception as e:
+        print(f" Retention skipped: {e}")
+
+    try:
+        matcher.index_jobs(df, vecs)
+        # full reconcile only when the index has drifted from the table
+        if matcher.job_index.ntotal != count_scraped_jobs():
+            matcher.sync_job_index()
+        matcher.job_index.flush()
+    except Exception as e:
+        print(f" Could not update job index: {e}")
+
     return {"job_embeddings": vecs}
 
 
@@ -48,7 +80,27 @@ def match_jobs_node(state):
     profile_vec = np.array(state["profile_vector"], dtype="float32")
     job_vecs = np.array(state["job_embeddings"], dtype="float32")
 
-    if profile_vec.size == 0 or job_vecs.size == 0:
+    if profile_vec.size == 0:
+        raise ValueError(" Empty embeddings received — cannot match jobs.")
+
+    # optional lexical prefilter (FTS) before the vector search
+    job_query = state.get("job_query")
+    job_filters = state.get("job_filters")
+
+    # default: one search against the whole scraped history
+    if state.get("match_scope", "history") == "history" and (
+        job_query or job_filters or matcher.job_index.ntotal > 0
+    ):
+        matched_df = matcher.match_job_history(
+            profile_vec,
+            top_k=10,
+            user_id=state["user_id"],
+            query=job_query,
+            filters=job_filters
+        )
+        return {"matched_jobs": matched_df.to_dict(orient="records")}
+
+    if job_vecs.size == 0:
         raise ValueError(" Empty embeddings received — cannot match jobs.")
 
     matched_df = matcher.match_jobs(
@@ -63,8 +115,9 @@ def match_jobs_node(state):
 
 
 def skill_gap_node(state):
+    # batch runs keep the default (mpnet) quality; the UI passes interactive_backend()
     df = pd.DataFrame(state["scraped_jobs"])
-    agent = SkillGapAgent(state["profile"], df)
+    agent = SkillGapAgent(state["profile"], df, backend=state.get("skill_gap_backend") or default_backend())
     recs = agent.get_recommendations()
     return {"skill_gap_recommendations": recs}
 
@@ -156,7 +209,9 @@ def jd_skill_gap_node(state):
     }])
 
     # Skill gap computation
-    agent = SkillGapAgent(profile, df)
+    # a handful of JD keywords: the fast backend is plenty
+    backend = state.get("skill_gap_backend") or interactive_backend()
+    agent = SkillGapAgent(profile, df, backend=backend)
     recs = agent.get_recommendations()
 
     return {
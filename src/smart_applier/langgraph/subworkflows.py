@@ -21,10 +21,17 @@ class State(TypedDict, total=False):
     profile: dict
     jd_text: str
     jd_keywords: List[str]
+    sources: List[str]
+    pages: int
     scraped_jobs: List[dict]
+    scrape_report: Dict[str, dict]
     matched_jobs: List[dict]
+    match_scope: str
+    job_query: str
+    job_filters: Dict[str, str]
     profile_vector: List[float]
     job_embeddings: List[List[float]]
+    skill_gap_backend: str
     skill_gap_recommendations: Dict[str, List[str]]
     resume_pdf_bytes: bytes
     tailored_resume_pdf_bytes: bytes
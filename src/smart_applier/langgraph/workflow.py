@@ -21,11 +21,18 @@ class State(TypedDict, total=False):
     user_id: str
     profile: dict
 
+    sources: List[str]
+    pages: int
     scraped_jobs: List[dict]
+    scrape_report: Dict[str, dict]
     profile_vector: List[float]
     job_embeddings: List[List[float]]
     matched_jobs: List[dict]
+    match_scope: str
+    job_query: str
+    job_filters: Dict[str, str]
 
+    skill_gap_backend: str
     skill_gap_recommendations: Dict[str, List[str]]
 
     resume_pdf_bytes: bytes
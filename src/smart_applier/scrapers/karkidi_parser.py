@@ -0,0 +1,178 @@
+# src/smart_applier/scrapers/karkidi_parser.py
+from typing import List, Dict, Any, Optional
+from datetime import datetime
+from functools import lru_cache
+from importlib.util import find_spec
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# span label → output field; the value is the next <p> after the label
+LABELS = {
+    "Key Skills": "skills",
+    "Summary": "summary",
+    "Posted On": "posted_on",
+}
+
+# only build a tree for the job cards, not the whole page
+_JOB_BLOCKS = SoupStrainer("div", class_="ads-details")
+
+
+@lru_cache(maxsize=1)
+def available_backends() -> List[str]:
+    """Parser backends usable in this environment, fastest first."""
+    backends = []
+    try:
+        import selectolax.lexbor  # noqa: F401  (optional, C-backed)
+        backends.append("selectolax")
+    except ImportError:
+        pass
+    if find_spec("lxml") is not None:
+        backends.append("lxml")
+    backends.append("html.parser")
+    return backends
+
+
+def default_backend() -> str:
+    return available_backends()[0]
+
+
+def _empty_job() -> Dict[str, Any]:
+    return {
+        "title": "",
+        "company": "Unknown Company",
+        "location": "",
+        "experience": "",
+        "skills": "",
+        "summary": "",
+        "posted_on": "",
+    }
+
+
+# -----------------------------
+# BeautifulSoup (html.parser / lxml)
+# -----------------------------
+def _extract_bs4(block) -> Dict[str, Any]:
+    """Single pass over the card's tags instead of one find() per field."""
+    job = _empty_job()
+    seen_title = seen_company = seen_location = seen_experience = False
+    pending = None
+
+    for tag in block.find_all(["h4", "a", "p", "span"]):
+        name = tag.name
+
+        if name == "span":
+            label = tag.get_text(strip=True)
+            if label in LABELS:
+                pending = LABELS[label]
+            continue
+
+        if name == "h4":
+            if not seen_title:
+                job["title"] = tag.get_text(strip=True)
+                seen_title = True
+            continue
+
+        if name == "a":
+            href = tag.get("href")
+            if not seen_company and href and "Employer-Profile" in href:
+                job["company"] = tag.get_text(strip=True)
+                seen_company = True
+            continue
+
+        # <p>
+        text = None
+        if not seen_location:
+            text = tag.get_text(strip=True)
+            job["location"] = text
+            seen_location = True
+        if not seen_experience and "emp-exp" in (tag.get("class") or []):
+            text = text if text is not None else tag.get_text(strip=True)
+            job["experience"] = text
+            seen_experience = True
+        if pending:
+            job[pending] = text if text is not None else tag.get_text(strip=True)
+            pending = None
+
+    return job
+
+
+def _parse_bs4(content, backend: str) -> List[Dict[str, Any]]:
+    soup = BeautifulSoup(content, backend, parse_only=_JOB_BLOCKS)
+    jobs = []
+    for block in soup.find_all("div", class_="ads-details"):
+        try:
+            jobs.append(_extract_bs4(block))
+        except Exception as e:
+            print(f" Error parsing job block: {e}")
+    return jobs
+
+
+# -----------------------------
+# selectolax (optional, C-backed)
+# -----------------------------
+def _parse_selectolax(content) -> List[Dict[str, Any]]:
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(content)
+    jobs = []
+    for block in tree.css("div.ads-details"):
+        try:
+            job = _empty_job()
+            seen_title = seen_company = seen_location = seen_experience = False
+            pending = None
+
+            for node in block.css("h4, a, p, span"):
+                tag = node.tag
+                if tag == "span":
+                    label = node.text(strip=True)
+                    if label in LABELS:
+                        pending = LABELS[label]
+                    continue
+                if tag == "h4":
+                    if not seen_title:
+                        job["title"] = node.text(strip=True)
+                        seen_title = True
+                    continue
+                if tag == "a":
+                    href = node.attributes.get("href")
+                    if not seen_company and href and "Employer-Profile" in href:
+                        job["company"] = node.text(strip=True)
+                        seen_company = True
+                    continue
+
+                text = node.text(strip=True)
+                if not seen_location:
+                    job["location"] = text
+                    seen_location = True
+                if not seen_experience and "emp-exp" in (node.attributes.get("class") or "").split():
+                    job["experience"] = text
+                    seen_experience = True
+                if pending:
+                    job[pending] = text
+                    pending = None
+
+            jobs.append(job)
+        except Exception as e:
+            print(f" Error parsing job block: {e}")
+    return jobs
+
+
+# -----------------------------
+# Public entry point
+# -----------------------------
+def parse_karkidi_page(content, backend: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Parse one Karkidi listing page into job records (scraped_jobs fields).
+    `backend` is "selectolax", "lxml" or "html.parser"; defaults to the
+    fastest one installed.
+    """
+    backend = backend or default_backend()
+    if backend == "selectolax":
+        jobs = _parse_selectolax(content)
+    else:
+        jobs = _parse_bs4(content, backend)
+
+    scraped_at = datetime.now().isoformat()
+    for job in jobs:
+        job["scraped_at"] = scraped_at
+    return jobs
@@ -0,0 +1,80 @@
+# src/smart_applier/scrapers/sources.py
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional, Type, Union
+from urllib.parse import urlparse
+
+from smart_applier.scrapers.karkidi_parser import parse_karkidi_page
+
+# columns of scraped_jobs filled from a scraped record
+JOB_FIELDS = ("title", "company", "location", "experience", "skills", "summary", "posted_on")
+
+
+class JobSource(ABC):
+    """
+    Adapter for one job board. Subclasses provide the listing URL for a page
+    number, a parser for the raw HTML/JSON, and their own politeness budget.
+    """
+
+    name: str = "base"
+    requests_per_second: float = 1.0
+    headers: Dict[str, str] = {}
+
+    @abstractmethod
+    def url_for(self, page: int) -> str:
+        """Listing URL of `page` (1-based)."""
+
+    @abstractmethod
+    def parse(self, content: bytes) -> List[Dict[str, Any]]:
+        """Raw records from one fetched page."""
+
+    @property
+    def host(self) -> str:
+        return urlparse(self.url_for(1)).netloc
+
+    def normalize(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a parsed record onto the scraped_jobs schema."""
+        job = {field: str(record.get(field) or "").strip() for field in JOB_FIELDS}
+        job["company"] = job["company"] or "Unknown Company"
+        job["scraped_at"] = record.get("scraped_at")
+        job["source"] = self.name
+        return job
+
+
+class KarkidiSource(JobSource):
+    name = "karkidi"
+    requests_per_second = 2.0
+
+    def __init__(self, base_url: str = "https://www.karkidi.com/Find-Jobs/{page}/all/India",
+                 parser_backend: Optional[str] = None, requests_per_second: Optional[float] = None):
+        self.base_url = base_url
+        self.parser_backend = parser_backend
+        if requests_per_second is not None:
+            self.requests_per_second = requests_per_second
+
+    def url_for(self, page: int) -> str:
+        return self.base_url.format(page=page)
+
+    def parse(self, content: bytes) -> List[Dict[str, Any]]:
+        return parse_karkidi_page(content, backend=self.parser_backend)
+
+
+# -----------------------------
+# Registry
+# -----------------------------
+SOURCES: Dict[str, Type[JobSource]] = {
+    "karkidi": KarkidiSource,
+}
+
+
+def register_source(source_cls: Type[JobSource]) -> Type[JobSource]:
+    """Class decorator so new boards can plug in without touching the scraper."""
+    SOURCES[source_cls.name] = source_cls
+    return source_cls
+
+
+def get_source(source: Union[str, JobSource]) -> JobSource:
+    if isinstance(source, JobSource):
+        return source
+    if source not in SOURCES:
+        raise ValueError(f" Unknown job source '{source}'. Available: {sorted(SOURCES)}")
+    return SOURCES[source]()
@@ -1,90 +1,94 @@
 # src/smart_applier/utils/db_utils.py
 import os
+import re
 import json
 import sqlite3
 from typing import List, Dict, Any, Optional
 from smart_applier.utils.path_utils import get_data_dirs
-from smart_applier.database.db_setup import initialize_database
+from smart_applier.utils.sql_utils import select_in
+from smart_applier.database.db_setup import initialize_database, job_fingerprint
+from smart_applier.database.connection import dict_factory, get_manager
+from smart_applier.database.blob_store import store_blob, decode_chunks
 
-# -----------------------------
-# Row factory → return dicts
-# -----------------------------
-def dict_factory(cursor, row):
-    return {col[0]: row[idx] for idx, col in enumerate(cursor.description)}
 
 # -----------------------------
-# DB Connection Helper
+# DB Connection Helpers
 # -----------------------------
-def get_connection(in_memory: bool = False) -> sqlite3.Connection:
-    paths = get_data_dirs()
-    db_path = paths["db_path"]
+def _conn() -> sqlite3.Connection:
+    """The calling thread's pooled connection (do NOT close it)."""
+    return get_manager().connection()
+
 
+def transaction(immediate: bool = False):
+    """Context manager: `with transaction() as conn:` commits once at the end."""
+    return get_manager().transaction(immediate=immediate)
+
+
+def get_connection(in_memory: bool = False) -> sqlite3.Connection:
+    """
+    Standalone connection owned by the caller (remember to close it), to the
+    same DB the helpers use - including the shared in-memory DB when
+    USE_IN_MEMORY_DB=1. `in_memory=True` gives a private, throwaway
+    :memory: DB instead. Internal helpers use the pooled per-thread connection.
+    """
     if in_memory:
         conn = sqlite3.connect(":memory:")
         conn.row_factory = dict_factory
         initialize_database(conn)
         return conn
 
-    if db_path is None:
-        raise RuntimeError("db_path is not configured (USE_IN_MEMORY_DB=1?)")
-
-    first_time = not db_path.exists()
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = dict_factory
-
-    if first_time:
-        initialize_database(conn)
-
-    return conn
+    get_manager().connection()  # make sure the schema is in place
+    return get_manager().connect()
 
 # -----------------------------
 #  PROFILES
 # -----------------------------
 def insert_or_update_profile(user_id: str, profile_data: dict):
-    conn = get_connection()
-    cur = conn.cursor()
-
-    profile_json = json.dumps(profile_data)
-    name = profile_data.get("personal", {}).get("name", "")
-    email = profile_data.get("personal", {}).get("email", "")
-    phone = profile_data.get("personal", {}).get("phone", "")
-    location = profile_data.get("personal", {}).get("location", "")
-    linkedin = profile_data.get("personal", {}).get("linkedin", "")
-    github = profile_data.get("personal", {}).get("github", "")
-
-    cur.execute("SELECT id FROM profiles WHERE user_id=?", (user_id,))
-    if cur.fetchone():
-        cur.execute("""
-            UPDATE profiles
-            SET name=?, email=?, phone=?, location=?, linkedin=?, github=?, data_json=?
-            WHERE user_id=?
-        """, (name, email, phone, location, linkedin, github, profile_json, user_id))
-    else:
-        cur.execute("""
-            INSERT INTO profiles (user_id, name, email, phone, location, linkedin, github, data_json)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (user_id, name, email, phone, location, linkedin, github, profile_json))
-
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        cur = conn.cursor()
+
+        profile_json = json.dumps(profile_data)
+        name = profile_data.get("personal", {}).get("name", "")
+        email = profile_data.get("personal", {}).get("email", "")
+        phone = profile_data.get("personal", {}).get("phone", "")
+        location = profile_data.get("personal", {}).get("location", "")
+        linkedin = profile_data.get("personal", {}).get("linkedin", "")
+        github = profile_data.get("personal", {}).get("github", "")
+
+        cur.execute("SELECT id FROM profiles WHERE user_id=?", (user_id,))
+        if cur.fetchone():
+            cur.execute("""
+                UPDATE profiles
+                SET name=?, email=?, phone=?, location=?, linkedin=?, github=?, data_json=?
+                WHERE user_id=?
+            """, (name, email, phone, location, linkedin, github, profile_json, user_id))
+        else:
+            cur.execute("""
+                INSERT INTO profiles (user_id, name, email, phone, location, linkedin, github, data_json)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (user_id, name, email, phone, location, linkedin, github, profile_json))
 
 
 def get_profile(user_id: str) -> Optional[dict]:
-    conn = get_connection()
-    cur = conn.cursor()
+    cur = _conn().cursor()
     cur.execute("SELECT data_json FROM profiles WHERE user_id=?", (user_id,))
     row = cur.fetchone()
-    conn.close()
 
     return json.loads(row["data_json"]) if row else None
 
 
+def get_profiles_by_user_ids(user_ids: List[str]) -> Dict[str, dict]:
+    if not user_ids:
+        return {}
+
+    rows = select_in(_conn(), "SELECT user_id, data_json FROM profiles WHERE user_id IN ({marks})", user_ids)
+    return {row["user_id"]: json.loads(row["data_json"]) for row in rows}
+
+
 def list_profiles():
-    conn = get_connection()
-    cur = conn.cursor()
+    cur = _conn().cursor()
     cur.execute("SELECT user_id, name, email,data_json, created_at FROM profiles ORDER BY created_at DESC")
     rows = cur.fetchall()
-    conn.close()
     return rows
 
 # Compatibility
@@ -95,47 +99,165 @@ def get_all_profiles():
 # -----------------------------
 # SCRAPED JOBS
 # -----------------------------
+def unique_jobs(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """First occurrence of each posting (by fingerprint), in order."""
+    seen = {}
+    for job in jobs:
+        seen.setdefault(job_fingerprint(job), job)
+    return list(seen.values())
+
+
 def bulk_insert_scraped_jobs(jobs: List[Dict[str, Any]]) -> List[int]:
     """
-    Insert jobs and return DB IDs in the SAME ORDER.
-    This ensures no NaN in db_id.
+    Upsert jobs by fingerprint and return DB IDs in the SAME ORDER.
+    Postings already stored get their existing id back (and a fresh scraped_at),
+    so duplicates never create new rows.
+
+    One executemany + one id lookup inside a single transaction (one commit).
     """
     if not jobs:
         return []
 
-    conn = get_connection()
-    cur = conn.cursor()
+    fingerprints = [job_fingerprint(job) for job in jobs]
+    # a posting repeated within the batch is written once
+    rows = [(
+        job.get("title") or job.get("Title"),
+        job.get("company") or job.get("Company"),
+        job.get("location") or job.get("Location"),
+        job.get("experience") or job.get("Experience"),
+        job.get("skills") or job.get("Skills"),
+        job.get("summary") or job.get("Summary"),
+        job.get("posted_on") or job.get("Posted On"),
+        job.get("source"),
+        job_fingerprint(job),
+    ) for job in unique_jobs(jobs)]
+
+    with transaction() as conn:
+        cur = conn.cursor()
+        cur.executemany("""
+            INSERT INTO scraped_jobs (title, company, location, experience, skills, summary, posted_on, source, fingerprint)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(fingerprint) DO UPDATE SET
+                posted_on = excluded.posted_on,
+                scraped_at = CURRENT_TIMESTAMP
+        """, rows)
+
+        # RETURNING order isn't guaranteed, so map fingerprints back to ids
+        ids_by_fp = _ids_by_fingerprint(cur, [row[-1] for row in rows])
+
+    return [ids_by_fp[fp] for fp in fingerprints]
+
+
+def _ids_by_fingerprint(cur: sqlite3.Cursor, fingerprints: List[str]) -> Dict[str, int]:
+    rows = select_in(cur, "SELECT id, fingerprint FROM scraped_jobs WHERE fingerprint IN ({marks})", fingerprints)
+    return {row["fingerprint"]: row["id"] for row in rows}
+
+
+def find_known_jobs(jobs: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Map fingerprint → existing scraped_jobs.id for the postings already stored."""
+    if not jobs:
+        return {}
+    return _ids_by_fingerprint(_conn().cursor(), [job_fingerprint(j) for j in jobs])
 
-    inserted_ids = []
 
-    for job in jobs:
-        cur.execute("""
-            INSERT INTO scraped_jobs (title, company, location, experience, skills, summary, posted_on)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            job.get("title") or job.get("Title"),
-            job.get("company") or job.get("Company"),
-            job.get("location") or job.get("Location"),
-            job.get("experience") or job.get("Experience"),
-            job.get("skills") or job.get("Skills"),
-            job.get("summary") or job.get("Summary"),
-            job.get("posted_on") or job.get("Posted On"),
-        ))
+def get_all_scraped_jobs(limit: int = 100):
+    cur = _conn().cursor()
+    cur.execute("SELECT * FROM scraped_jobs ORDER BY id DESC LIMIT ?", (limit,))
+    rows = cur.fetchall()
+    return rows
 
-        inserted_ids.append(cur.lastrowid)
 
-    conn.commit()
-    conn.close()
+def get_database_identity() -> Optional[str]:
+    """Random id of this database (migration 6); changes when the DB is recreated."""
+    row = _conn().execute("SELECT value FROM db_meta WHERE key='instance_id'").fetchone()
+    return row["value"] if row else None
 
-    return inserted_ids
 
+def get_scraped_job_ids() -> List[int]:
+    cur = _conn().cursor()
+    cur.execute("SELECT id FROM scraped_jobs")
+    ids = [row["id"] for row in cur.fetchall()]
+    return ids
 
-def get_all_scraped_jobs(limit: int = 100):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM scraped_jobs ORDER BY id DESC LIMIT ?", (limit,))
+
+def get_scraped_jobs_by_ids(job_ids: List[int]) -> List[Dict[str, Any]]:
+    """
+    Fetch scraped jobs by id, returned in the SAME ORDER as `job_ids`
+    (ids that no longer exist are skipped).
+    """
+    if not job_ids:
+        return []
+
+    job_ids = [int(i) for i in job_ids]
+    rows = select_in(_conn(), "SELECT * FROM scraped_jobs WHERE id IN ({marks})", job_ids)
+    by_id = {row["id"]: row for row in rows}
+    return [by_id[i] for i in job_ids if i in by_id]
+
+
+# -----------------------------
+#  FULL-TEXT SEARCH (scraped_jobs_fts)
+# -----------------------------
+# bm25 column weights: title, company, location, skills, summary
+FTS_WEIGHTS = (5.0, 2.0, 1.0, 3.0, 1.0)
+
+
+def fts_query(text: str, match_any: bool = False) -> str:
+    """
+    Turn free text into a safe FTS5 query: every word is quoted (so input
+    like `c++` or `"` can't break the syntax) and prefix-matched.
+    """
+    terms = [f'"{t}"*' for t in re.findall(r"\w+", text or "")]
+    return (" OR " if match_any else " ").join(terms)
+
+
+def search_jobs(query: Optional[str] = None, filters: Optional[Dict[str, Any]] = None,
+                limit: int = 50, match_any: bool = False) -> List[Dict[str, Any]]:
+    """
+    Keyword search over scraped jobs, best matches first (bm25).
+
+    query:   free text; all words must appear (any word with match_any=True)
+    filters: company / location (substring, case-insensitive), source (exact),
+             scraped_after (timestamp string, e.g. "2025-01-01")
+    Without a query, filtered jobs come back newest first. A query with no
+    searchable words (e.g. only punctuation) matches nothing.
+    """
+    filters = filters or {}
+    clauses, params = [], []
+
+    match = fts_query(query, match_any)
+    if query and query.strip() and not match:
+        return []
+    if match:
+        clauses.append("scraped_jobs_fts MATCH ?")
+        params.append(match)
+
+    for column in ("company", "location"):
+        if filters.get(column):
+            clauses.append(f"s.{column} LIKE ?")
+            params.append(f"%{filters[column]}%")
+    if filters.get("source"):
+        clauses.append("s.source = ?")
+        params.append(filters["source"])
+    if filters.get("scraped_after"):
+        clauses.append("s.scraped_at >= ?")
+        params.append(filters["scraped_after"])
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    if match:
+        weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+        sql = f"""
+            SELECT s.*, bm25(scraped_jobs_fts, {weights}) AS rank
+            FROM scraped_jobs_fts
+            JOIN scraped_jobs s ON s.id = scraped_jobs_fts.rowid
+            {where}
+            ORDER BY rank LIMIT ?
+        """
+    else:
+        sql = f"SELECT s.* FROM scraped_jobs s {where} ORDER BY s.id DESC LIMIT ?"
+
+    cur = _conn().cursor()
+    cur.execute(sql, (*params, limit))
     rows = cur.fetchall()
-    conn.close()
     return rows
 
 
@@ -143,22 +265,34 @@ def get_all_scraped_jobs(limit: int = 100):
 #  TOP MATCHED JOBS (SEPARATE TABLE)
 # -----------------------------
 def insert_top_matched(job_id: int, user_id: str, score: float):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("""
-        INSERT INTO top_matched_jobs (job_id, user_id, score)
-        VALUES (?, ?, ?)
-    """, (job_id, user_id, score))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        cur = conn.cursor()
+        cur.execute("""
+            INSERT INTO top_matched_jobs (job_id, user_id, score)
+            VALUES (?, ?, ?)
+        """, (job_id, user_id, score))
+
+
+def bulk_insert_top_matched(rows: List[tuple]):
+    """
+    rows: (job_id, user_id, score) tuples, written in ONE transaction.
+    """
+    if not rows:
+        return
+
+    with transaction() as conn:
+        cur = conn.cursor()
+        cur.executemany("""
+            INSERT INTO top_matched_jobs (job_id, user_id, score)
+            VALUES (?, ?, ?)
+        """, rows)
 
 
 def get_latest_top_matched(limit: int = 50):
     """
     Join top_matched_jobs with scraped_jobs cleanly.
     """
-    conn = get_connection()
-    cur = conn.cursor()
+    cur = _conn().cursor()
 
     cur.execute("""
         SELECT
@@ -181,40 +315,142 @@ def get_latest_top_matched(limit: int = 50):
     """, (limit,))
 
     rows = cur.fetchall()
-    conn.close()
     return rows
 
 
 # -----------------------------
-#  RESUMES (PDF as BLOB)
+#  DASHBOARD STATS (SQL aggregates)
 # -----------------------------
-def insert_resume(user_id: str, resume_type: str, file_name: str, pdf_blob: bytes):
-    conn = get_connection()
-    cur = conn.cursor()
+def count_scraped_jobs() -> int:
+    cur = _conn().cursor()
+    cur.execute("SELECT COUNT(*) AS n FROM scraped_jobs")
+    return cur.fetchone()["n"]
+
+
+def count_top_matched(user_id: Optional[str] = None) -> int:
+    cur = _conn().cursor()
+    if user_id is None:
+        cur.execute("SELECT COUNT(*) AS n FROM top_matched_jobs")
+    else:
+        cur.execute("SELECT COUNT(*) AS n FROM top_matched_jobs WHERE user_id=?", (user_id,))
+    return cur.fetchone()["n"]
+
+
+def get_matches_per_user(limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """user_id, number of matches, best score and last match time; busiest users first."""
+    cur = _conn().cursor()
     cur.execute("""
-        INSERT INTO resumes (user_id, resume_type, file_name, pdf_blob)
-        VALUES (?, ?, ?, ?)
-    """, (user_id, resume_type, file_name, sqlite3.Binary(pdf_blob)))
-    conn.commit()
-    conn.close()
+        SELECT
+            user_id,
+            COUNT(*) AS matches,
+            MAX(score) AS best_score,
+            MAX(created_at) AS last_matched
+        FROM top_matched_jobs
+        GROUP BY user_id
+        ORDER BY matches DESC
+        LIMIT ?
+    """, (-1 if limit is None else limit,))
+    return cur.fetchall()
 
 
-def list_resumes(limit: int = 100):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT id, user_id, resume_type, file_name, created_at FROM resumes ORDER BY id DESC LIMIT ?", (limit,))
+def get_dashboard_stats(recent: int = 3) -> Dict[str, Any]:
+    """
+    Everything the dashboard metrics need, computed in SQL: only the counts,
+    per-user aggregates and the `recent` latest matches leave the database.
+    """
+    return {
+        "total_jobs": count_scraped_jobs(),
+        "total_matches": count_top_matched(),
+        "matches_per_user": get_matches_per_user(),
+        "recent_matches": get_latest_top_matched(limit=recent),
+    }
+
+
+# -----------------------------
+#  RESUMES (metadata + content-addressed PDF in resume_blobs)
+# -----------------------------
+def insert_resume(user_id: str, resume_type: str, file_name: str, pdf_blob: bytes):
+    """Identical PDFs (e.g. the same profile rebuilt) share one stored blob."""
+    with transaction() as conn:
+        digest = store_blob(conn, bytes(pdf_blob))
+        cur = conn.cursor()
+        cur.execute("""
+            INSERT INTO resumes (user_id, resume_type, file_name, blob_hash)
+            VALUES (?, ?, ?, ?)
+        """, (user_id, resume_type, file_name, digest))
+
+
+def list_resumes(limit: int = 100, offset: int = 0, user_id: Optional[str] = None,
+                 resume_type: Optional[str] = None):
+    """
+    Resume metadata only (no PDF bytes), newest first, optionally filtered.
+    `size_bytes` is the original PDF size recorded in resume_blobs.
+    """
+    where, params = _resume_filters(user_id, resume_type)
+    cur = _conn().cursor()
+    cur.execute(f"""
+        SELECT r.id, r.user_id, r.resume_type, r.file_name, r.created_at, b.size AS size_bytes
+        FROM resumes r
+        LEFT JOIN resume_blobs b ON b.hash = r.blob_hash
+        {where}
+        ORDER BY r.id DESC LIMIT ? OFFSET ?
+    """, (*params, limit, offset))
     rows = cur.fetchall()
-    conn.close()
     return rows
 
 
-def get_resume_blob(resume_id: int):
-    conn = get_connection()
+def count_resumes(user_id: Optional[str] = None, resume_type: Optional[str] = None) -> int:
+    where, params = _resume_filters(user_id, resume_type)
+    cur = _conn().cursor()
+    cur.execute(f"SELECT COUNT(*) AS n FROM resumes r {where}", params)
+    return cur.fetchone()["n"]
+
+
+def _resume_filters(user_id: Optional[str], resume_type: Optional[str]):
+    clauses, params = [], []
+    if user_id is not None:
+        clauses.append("r.user_id=?")
+        params.append(user_id)
+    if resume_type is not None:
+        clauses.append("r.resume_type=?")
+        params.append(resume_type)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return where, params
+
+
+def iter_resume_blob(resume_id: int, chunk_size: int = 64 * 1024):
+    """
+    Stream one resume PDF in chunks with SQLite incremental BLOB I/O
+    (decompressing on the fly), so the full value is never materialized
+    as a single query result.
+    """
+    conn = _conn()
     cur = conn.cursor()
-    cur.execute("SELECT pdf_blob FROM resumes WHERE id=?", (resume_id,))
+    cur.execute("""
+        SELECT b.rowid AS blob_rowid, b.codec
+        FROM resumes r JOIN resume_blobs b ON b.hash = r.blob_hash
+        WHERE r.id=?
+    """, (resume_id,))
     row = cur.fetchone()
-    conn.close()
-    return row["pdf_blob"] if row else None
+    if not row:
+        return
+
+    def raw_chunks():
+        with conn.blobopen("resume_blobs", "data", row["blob_rowid"], readonly=True) as blob:
+            while True:
+                chunk = blob.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    yield from decode_chunks(raw_chunks(), row["codec"])
+
+
+def get_resume_blob(resume_id: int):
+    data = b"".join(iter_resume_blob(resume_id))
+    return data or None
+
+
 # -----------------------------
 # Compatibility exports for UI
 # -----------------------------
@@ -0,0 +1,217 @@
+# smart_applier/utils/embedding_cache.py
+import os
+import time
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from smart_applier.utils.path_utils import get_data_dirs
+from smart_applier.utils.sql_utils import select_in
+
+DEFAULT_MAX_MB = 256
+TOUCH_FLUSH_EVERY = 1000
+
+
+def text_key(text: str) -> str:
+    """Content address of an already-preprocessed text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    On-disk embedding cache keyed by (model name, sha256 of preprocessed text).
+    Lives in its own SQLite file next to smart_applier.db so cache churn never
+    locks the main DB. Least-recently-used rows are evicted once the stored
+    vectors exceed `max_bytes`. Hits only record their `last_used` time in
+    memory; those touches are written with the next put (or every
+    TOUCH_FLUSH_EVERY hits).
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_bytes: Optional[int] = None):
+        if path is None:
+            path = get_data_dirs()["root"] / "embedding_cache.db"
+        if max_bytes is None:
+            max_bytes = int(os.getenv("EMBEDDING_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024
+
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)")
+        self._conn.commit()
+
+        # running total of stored vector bytes, and hits not yet written back
+        self._size = self._count_bytes_locked()
+        self._touched: Dict[tuple, float] = {}
+
+    # -----------------------------
+    # Lookups
+    # -----------------------------
+    def get_many(self, model: str, keys: List[str]) -> Dict[str, np.ndarray]:
+        if not keys:
+            return {}
+
+        unique = list(dict.fromkeys(keys))
+
+        with self._lock:
+            rows = select_in(
+                self._conn,
+                "SELECT text_hash, dim, vector FROM embeddings WHERE model=? AND text_hash IN ({marks})",
+                unique, params=(model,),
+            )
+            found = {text_hash: np.frombuffer(blob, dtype="float32", count=dim) for text_hash, dim, blob in rows}
+
+            if found:
+                now = time.time()
+                self._touched.update(((model, k), now) for k in found)
+                if len(self._touched) >= TOUCH_FLUSH_EVERY:
+                    self._flush_touches_locked()
+                    self._conn.commit()
+
+            self.hits += len(found)
+            self.misses += len(unique) - len(found)
+
+        return found
+
+    def put_many(self, model: str, items: Dict[str, np.ndarray]):
+        if not items:
+            return
+
+        now = time.time()
+        rows = []
+        for key, vec in items.items():
+            vec = np.ascontiguousarray(vec, dtype="float32").ravel()
+            rows.append((model, key, vec.shape[0], vec.tobytes(), now))
+
+        with self._lock:
+            replaced = select_in(
+                self._conn,
+                "SELECT LENGTH(vector) FROM embeddings WHERE model=? AND text_hash IN ({marks})",
+                list(items), params=(model,),
+            )
+            self._flush_touches_locked()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, dim, vector, last_used) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._size += sum(len(row[3]) for row in rows) - sum(n for (n,) in replaced)
+            self._evict_locked(avg_bytes=len(rows[0][3]))
+            self._conn.commit()
+
+    # -----------------------------
+    # Eviction & stats
+    # -----------------------------
+    def _count_bytes_locked(self) -> int:
+        row = self._conn.execute("SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings").fetchone()
+        return int(row[0])
+
+    def _flush_touches_locked(self):
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE embeddings SET last_used=? WHERE model=? AND text_hash=?",
+                [(ts, model, key) for (model, key), ts in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict_locked(self, avg_bytes: int):
+        if self._size <= self.max_bytes:
+            return
+
+        # drop the oldest rows until we are back under ~90% of the budget;
+        # the batch size is estimated from the row size and refined per pass
+        target = int(self.max_bytes * 0.9)
+        oldest = "SELECT rowid FROM embeddings ORDER BY last_used ASC LIMIT ?"
+        while self._size > target:
+            n = max(1, -(-(self._size - target) // max(1, avg_bytes)))
+            freed, count = self._conn.execute(
+                f"SELECT COALESCE(SUM(LENGTH(vector)), 0), COUNT(*) FROM embeddings WHERE rowid IN ({oldest})",
+                (n,),
+            ).fetchone()
+            if not count:
+                break
+            self._conn.execute(f"DELETE FROM embeddings WHERE rowid IN ({oldest})", (n,))
+            self._size -= int(freed)
+            self.evictions += count
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            size = self._size
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size_mb": round(size / (1024 * 1024), 2),
+        }
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self._size = 0
+            self._touched.clear()
+
+
+# -----------------------------
+# Process-wide cache + encode helper
+# -----------------------------
+_cache: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = EmbeddingCache()
+    return _cache
+
+
+def cached_encode(model, model_name: str, texts: List[str], cache: Optional[EmbeddingCache] = None) -> np.ndarray:
+    """
+    Encode `texts` (already preprocessed) through the cache.
+    Only misses reach the model, deduplicated and encoded in a single batch.
+    Returns a float32 matrix with one row per input text.
+    """
+    cache = cache or get_embedding_cache()
+    keys = [text_key(t) for t in texts]
+
+    vectors = cache.get_many(model_name, keys)
+
+    pending: Dict[str, str] = {}
+    for key, text in zip(keys, texts):
+        if key not in vectors and key not in pending:
+            pending[key] = text
+
+    if pending:
+        encoded = model.encode(list(pending.values()), convert_to_numpy=True).astype("float32")
+        fresh = dict(zip(pending.keys(), encoded))
+        cache.put_many(model_name, fresh)
+        vectors.update(fresh)
+
+    if not keys:
+        return np.zeros((0, model.get_sentence_embedding_dimension()), dtype="float32")
+
+    return np.vstack([vectors[k] for k in keys]).astype("float32")
@@ -0,0 +1,75 @@
+# smart_applier/utils/http_utils.py
+import time
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class HostRateLimiter:
+    """
+    Per-host request pacing shared by all worker threads.
+    Each call to `wait(url)` reserves the next free slot for that host
+    (1 / requests_per_second apart) and sleeps until it arrives.
+    """
+
+    def __init__(self, requests_per_second: float = 2.0, per_host: Optional[Dict[str, float]] = None):
+        self.default_rps = requests_per_second
+        self.per_host = per_host or {}
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _interval(self, host: str) -> float:
+        rps = self.per_host.get(host, self.default_rps)
+        return 1.0 / rps if rps and rps > 0 else 0.0
+
+    def wait(self, url: str) -> float:
+        host = urlparse(url).netloc
+        interval = self._interval(host)
+        if interval == 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+def build_session(
+    headers: Optional[Dict[str, str]] = None,
+    pool_size: int = 8,
+    max_retries: int = 3,
+    backoff: float = 0.5,
+) -> requests.Session:
+    """
+    Keep-alive session with a connection pool sized for `pool_size` workers.
+    Connection errors, 429 and 5xx responses are retried with exponential
+    backoff (honouring Retry-After).
+    """
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=backoff,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
@@ -0,0 +1,453 @@
+# smart_applier/utils/job_index.py
+import os
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import numpy as np
+import faiss
+
+from smart_applier.utils.path_utils import get_data_dirs
+
+INDEX_TYPES = ("flat", "hnsw", "ivfpq")
+
+DEFAULT_INDEX_PARAMS = {
+    # HNSW
+    "hnsw_m": 32,
+    "ef_construction": 200,
+    "ef_search": 64,
+    # IVF-PQ
+    "nlist": 1024,
+    "pq_m": 16,
+    "pq_nbits": 8,
+    "nprobe": 16,
+    # max vectors used to train IVF-PQ
+    "train_sample": 50000,
+}
+
+# HNSW: rebuild on flush once removed rows exceed this share of the graph
+COMPACT_FRACTION = 0.1
+
+
+def _index_path(model_name: str, index_type: str = "flat") -> Path:
+    safe = model_name.replace("/", "_")
+    suffix = "" if index_type == "flat" else f"_{index_type}"
+    return get_data_dirs()["jobs"] / f"job_index_{safe}{suffix}.faiss"
+
+
+def _params(params: Optional[dict]) -> dict:
+    merged = dict(DEFAULT_INDEX_PARAMS)
+    merged.update(params or {})
+    return merged
+
+
+def ivfpq_min_train(params: Optional[dict] = None) -> int:
+    """Training vectors IVF-PQ codebooks need (~39 per centroid)."""
+    return 39 * 2 ** _params(params)["pq_nbits"]
+
+
+def make_faiss_index(index_type: str, dim: int, params: Optional[dict] = None,
+                     train_vectors: Optional[np.ndarray] = None):
+    """
+    Empty inner-product index: "flat" (exact), "hnsw" or "ivfpq" (falls back
+    to flat when there are too few training vectors).
+    """
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f" Unknown index_type '{index_type}'. Use one of {INDEX_TYPES}.")
+
+    p = _params(params)
+
+    if index_type == "flat":
+        return faiss.IndexFlatIP(dim)
+
+    if index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, p["hnsw_m"], faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = p["ef_construction"]
+        index.hnsw.efSearch = p["ef_search"]
+        return index
+
+    # ---- IVF-PQ ----
+    n_train = 0 if train_vectors is None else len(train_vectors)
+    min_train = ivfpq_min_train(p)
+    if n_train < min_train:
+        print(f" IVF-PQ needs >= {min_train} training vectors (got {n_train}); using flat index.")
+        return faiss.IndexFlatIP(dim)
+
+    # pq_m must divide dim; take the largest divisor not above the request
+    pq_m = next(m for m in range(min(p["pq_m"], dim), 0, -1) if dim % m == 0)
+    # ~39 points per centroid keeps k-means well conditioned
+    nlist = max(1, min(p["nlist"], n_train // 39))
+
+    sample = np.ascontiguousarray(train_vectors, dtype="float32")
+    if n_train > p["train_sample"]:
+        rng = np.random.default_rng(0)
+        sample = sample[rng.choice(n_train, p["train_sample"], replace=False)]
+
+    quantizer = faiss.IndexFlatIP(dim)
+    index = faiss.IndexIVFPQ(quantizer, dim, nlist, pq_m, p["pq_nbits"], faiss.METRIC_INNER_PRODUCT)
+    index.train(sample)
+    index.nprobe = min(p["nprobe"], nlist)
+    return index
+
+
+def apply_search_params(index, params: Optional[dict] = None):
+    """Set nprobe / efSearch on a (possibly IDMap-wrapped) index after loading."""
+    p = _params(params)
+    inner = faiss.downcast_index(index.index) if isinstance(index, faiss.IndexIDMap) else index
+
+    if isinstance(inner, faiss.IndexHNSW):
+        inner.hnsw.efSearch = p["ef_search"]
+    elif isinstance(inner, faiss.IndexIVF):
+        inner.nprobe = min(p["nprobe"], inner.nlist)
+    return index
+
+
+def index_kind(index) -> str:
+    inner = faiss.downcast_index(index.index) if isinstance(index, faiss.IndexIDMap) else index
+    if isinstance(inner, faiss.IndexHNSW):
+        return "hnsw"
+    if isinstance(inner, faiss.IndexIVF):
+        return "ivfpq"
+    return "flat"
+
+
+class JobIndex:
+    """
+    Persistent FAISS index (IndexIDMap2) over scraped jobs, keyed by scraped_jobs.id
+    and tied to one database through a `.meta.json` sidecar (see bind()).
+    Changes go to one in-memory copy and reach the file on flush().
+    """
+
+    def __init__(self, model_name: str, index_type: str = "flat",
+                 params: Optional[dict] = None, path: Optional[Path] = None):
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f" Unknown index_type '{index_type}'. Use one of {INDEX_TYPES}.")
+        self.model_name = model_name
+        self.index_type = index_type
+        self.params = _params(params)
+        self.path = Path(path) if path else _index_path(model_name, index_type)
+        self.meta_path = self.path.with_suffix(".meta.json")
+        self.db_identity: Optional[str] = None
+        self._lock = threading.RLock()
+        self._reader = None
+        self._reader_mtime = None
+        # writable copy, its job id -> row map, and whether it differs from the file
+        self._writer = None
+        self._writer_mtime = None
+        self._rows: Dict[int, int] = {}
+        self._dirty = False
+        # HNSW rows removed but still in the graph (hidden from search until compacted)
+        self._deleted: Set[int] = set()
+
+    # -----------------------------
+    # Loading / saving
+    # -----------------------------
+    def _new_index(self, dim: int, train_vectors: Optional[np.ndarray] = None):
+        inner = make_faiss_index(self.index_type, dim, self.params, train_vectors)
+        return faiss.IndexIDMap2(inner)
+
+    def _read(self, mmap: bool):
+        index = None
+        if mmap and hasattr(faiss, "IO_FLAG_MMAP_IFC"):
+            try:
+                index = faiss.read_index(str(self.path), faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY)
+            except Exception as e:
+                print(f" Could not mmap job index, loading into memory: {e}")
+        if index is None:
+            index = faiss.read_index(str(self.path))
+        return apply_search_params(index, self.params)
+
+    def _mtime(self) -> Optional[int]:
+        return self.path.stat().st_mtime_ns if self.path.exists() else None
+
+    def _searchable(self):
+        """Unsaved writer if there is one, else a read-only (mmap) view reopened when the file changes."""
+        mtime = self._mtime()
+        if self._writer is not None and (self._dirty or self._writer_mtime == mtime):
+            return self._writer
+        self._writer = None
+        if mtime is None:
+            return None
+        if self._reader is None or self._reader_mtime != mtime:
+            self._reader = self._read(mmap=True)
+            self._reader_mtime = mtime
+            self._deleted = set(self._meta().get("deleted", []))
+        return self._reader
+
+    def _writable(self, dim: Optional[int] = None, train_vectors: Optional[np.ndarray] = None):
+        mtime = self._mtime()
+        if self._writer is not None and (self._dirty or self._writer_mtime == mtime):
+            return self._writer
+        if mtime is not None:
+            index = self._read(mmap=False)
+            self._deleted = set(self._meta().get("deleted", []))
+        elif dim is None:
+            return None
+        else:
+            index = self._new_index(dim, train_vectors)
+        self._writer_mtime = mtime
+        self._set_writer(index)
+        return index
+
+    def _set_writer(self, index):
+        self._writer = index
+        self._rows = {job_id: row for row, job_id in enumerate(self._ids_of(index).tolist())}
+
+    def _save(self, index):
+        tmp = self.path.with_suffix(".tmp")
+        faiss.write_index(index, str(tmp))
+        os.replace(tmp, self.path)
+        meta = {"db_identity": self.db_identity, "deleted": sorted(self._deleted)}
+        self.meta_path.write_text(json.dumps(meta), encoding="utf-8")
+        self._writer_mtime = self._mtime()
+        self._dirty = False
+        self._reader = None
+
+    def _meta(self) -> dict:
+        try:
+            return json.loads(self.meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def bind(self, db_identity: Optional[str]) -> bool:
+        """
+        Tie the index to a database. Returns True (and empties the index) when
+        the file on disk was built from a different one, whose job ids mean
+        other jobs here.
+        """
+        with self._lock:
+            self.db_identity = db_identity
+            if self.path.exists() and self._meta().get("db_identity") != db_identity:
+                print(" Job index was built from another database — resetting it.")
+                self.reset()
+                return True
+            return False
+
+    def flush(self) -> bool:
+        """Write pending changes to disk (compacting HNSW first if many rows were removed)."""
+        with self._lock:
+            if not self._dirty:
+                return False
+            index = self._writer
+            if len(self._deleted) > COMPACT_FRACTION * index.ntotal:
+                index = self._compact(index)
+            self._save(index)
+            return True
+
+    # -----------------------------
+    # Mutations (in memory until flush())
+    # -----------------------------
+    def add(self, ids: Iterable[int], vectors: np.ndarray) -> int:
+        """
+        Add vectors for new job ids and replace those of known ids whose vector
+        changed (identical ones are left alone). Returns how many were written.
+        """
+        ids = np.asarray(list(ids), dtype="int64")
+        if ids.size == 0:
+            return 0
+
+        vectors = np.ascontiguousarray(vectors, dtype="float32").reshape(len(ids), -1).copy()
+        faiss.normalize_L2(vectors)
+
+        # last vector wins within the batch
+        rows = list({job_id: i for i, job_id in enumerate(ids.tolist())}.values())
+        ids, vectors = ids[rows], vectors[rows]
+
+        with self._lock:
+            index = self._writable(dim=vectors.shape[1], train_vectors=vectors)
+            if index.d != vectors.shape[1]:
+                raise ValueError(f" Job index dim {index.d} does not match vectors dim {vectors.shape[1]}.")
+
+            known = np.fromiter((job_id in self._rows for job_id in ids.tolist()), dtype=bool, count=len(ids))
+            if known.any():
+                keep = ~known
+                keep[known] = ~self._unchanged(index, ids[known], vectors[known])
+                ids, vectors, known = ids[keep], vectors[keep], known[keep]
+                if ids.size == 0:
+                    return 0
+                if known.any():
+                    self._replace(index, ids[known], vectors[known])
+
+            new = ~known
+            if new.any():
+                start = index.ntotal
+                index.add_with_ids(vectors[new], ids[new])
+                self._rows.update((job_id, start + i) for i, job_id in enumerate(ids[new].tolist()))
+
+            # IVF-PQ starts as flat until it has enough jobs to train on
+            if (self.index_type == "ivfpq" and index_kind(index) == "flat"
+                    and index.ntotal >= ivfpq_min_train(self.params)):
+                self._promote(index)
+
+            self._dirty = True
+            return int(ids.size)
+
+    def _promote(self, index):
+        """Retrain the flat stand-in as IVF-PQ on the vectors it already holds."""
+        all_ids = self._ids_of(index)
+        vectors = faiss.downcast_index(index.index).reconstruct_n(0, index.ntotal)
+        print(f" Job index: training IVF-PQ on {len(all_ids)} jobs.")
+        promoted = self._new_index(index.d, train_vectors=vectors)
+        promoted.add_with_ids(vectors, all_ids)
+        self._set_writer(promoted)
+        return promoted
+
+    def _unchanged(self, index, ids: np.ndarray, vectors: np.ndarray) -> np.ndarray:
+        """Which known, live ids already hold these vectors (only exact for flat / HNSW storage)."""
+        if index_kind(index) == "ivfpq":
+            return np.zeros(len(ids), dtype=bool)
+        stored = np.vstack([index.reconstruct(int(job_id)) for job_id in ids])
+        live = ~np.isin(ids, list(self._deleted))
+        return live & np.all(np.isclose(stored, vectors, atol=1e-6), axis=1)
+
+    def _replace(self, index, ids: np.ndarray, vectors: np.ndarray):
+        """
+        Overwrite the vectors of known ids. Flat and HNSW rows are written in
+        place (HNSW keeps its graph links); IVF-PQ codes are re-encoded.
+        """
+        self._deleted.difference_update(ids.tolist())
+        kind = index_kind(index)
+        if kind == "ivfpq":
+            index.remove_ids(ids)
+            index.add_with_ids(vectors, ids)
+            self._set_writer(index)
+            return
+
+        inner = faiss.downcast_index(index.index)
+        storage = faiss.downcast_index(inner.storage) if kind == "hnsw" else inner
+        stored = faiss.rev_swig_ptr(storage.get_xb(), storage.ntotal * storage.d)
+        stored = stored.reshape(storage.ntotal, storage.d)
+        stored[[self._rows[job_id] for job_id in ids.tolist()]] = vectors
+
+    def _compact(self, index):
+        """Rebuild an HNSW graph without its removed rows."""
+        all_ids = self._ids_of(index)
+        keep = ~np.isin(all_ids, list(self._deleted))
+        inner = faiss.downcast_index(index.index)
+        kept_vectors = inner.reconstruct_n(0, inner.ntotal)[keep]
+        rebuilt = self._new_index(index.d)
+        if keep.any():
+            rebuilt.add_with_ids(kept_vectors, all_ids[keep])
+        self._deleted.clear()
+        self._set_writer(rebuilt)
+        return rebuilt
+
+    def remove(self, ids: Iterable[int]) -> int:
+        with self._lock:
+            index = self._writable()
+            if index is None:
+                return 0
+            ids = [job_id for job_id in dict.fromkeys(int(i) for i in ids)
+                   if job_id in self._rows and job_id not in self._deleted]
+            if not ids:
+                return 0
+
+            if index_kind(index) == "hnsw":
+                # HNSW cannot delete in place; hide the rows until the next compaction
+                self._deleted.update(ids)
+            else:
+                index.remove_ids(np.asarray(ids, dtype="int64"))
+                self._set_writer(index)
+            self._dirty = True
+            return len(ids)
+
+    def rebuild(self, ids: Iterable[int], vectors: np.ndarray) -> int:
+        """Replace the whole index (also retrains IVF-PQ on the current corpus) and save it."""
+        with self._lock:
+            self.reset()
+            added = self.add(ids, vectors)
+            self.flush()
+            return added
+
+    def reset(self):
+        with self._lock:
+            for path in (self.path, self.meta_path):
+                if path.exists():
+                    path.unlink()
+            self._reader = None
+            self._writer = None
+            self._rows = {}
+            self._deleted = set()
+            self._dirty = False
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+    @staticmethod
+    def _ids_of(index) -> np.ndarray:
+        return faiss.vector_to_array(index.id_map).astype("int64")
+
+    def ids(self) -> np.ndarray:
+        with self._lock:
+            index = self._searchable()
+            if index is None:
+                return np.zeros(0, dtype="int64")
+            ids = self._ids_of(index)
+            if self._deleted:
+                ids = ids[~np.isin(ids, list(self._deleted))]
+            return ids
+
+    @property
+    def ntotal(self) -> int:
+        with self._lock:
+            index = self._searchable()
+            return int(index.ntotal) - len(self._deleted) if index is not None else 0
+
+    def search(self, queries: np.ndarray, top_k: int = 10,
+               params: Optional[dict] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Search one or many query vectors. Returns (scores, job_ids); missing
+        slots (fewer jobs than top_k) have job id -1. `params` overrides
+        nprobe / ef_search for this call only.
+        """
+        queries = np.ascontiguousarray(queries, dtype="float32").copy()
+        if queries.ndim == 1:
+            queries = queries.reshape(1, -1)
+        faiss.normalize_L2(queries)
+
+        with self._lock:
+            index = self._searchable()
+            live = int(index.ntotal) - len(self._deleted) if index is not None else 0
+            if live == 0:
+                n = queries.shape[0]
+                return np.zeros((n, 0), dtype="float32"), np.zeros((n, 0), dtype="int64")
+            # the index is shared; set this call's knobs under the lock, every time
+            p = {**self.params, **(params or {})}
+            apply_search_params(index, p)
+            if not self._deleted:
+                return index.search(queries, min(top_k, live))
+
+            removed = faiss.IDSelectorBatch(np.fromiter(self._deleted, dtype="int64"))
+            search_params = faiss.SearchParametersHNSW(sel=faiss.IDSelectorNot(removed), efSearch=p["ef_search"])
+            return index.search(queries, min(top_k, live), params=search_params)
+
+
+# -----------------------------
+# One index object per model per process
+# -----------------------------
+_indexes: Dict[Tuple[str, str], JobIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_job_index(model_name: str = "all-MiniLM-L6-v2", index_type: str = "flat",
+                  params: Optional[dict] = None) -> JobIndex:
+    """
+    Shared JobIndex for (model, index type). `params` only shape a newly
+    built index; pass search knobs to JobIndex.search per call.
+    """
+    key = (model_name, index_type)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = JobIndex(model_name, index_type, params)
+        return index
+
+
+def reset_job_indexes():
+    """Drop every saved job index (all models / types), e.g. after scraped_jobs was cleared."""
+    with _indexes_lock:
+        for index in _indexes.values():
+            index.reset()
+    for path in get_data_dirs()["jobs"].glob("job_index_*"):
+        path.unlink()
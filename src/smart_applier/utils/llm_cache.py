@@ -0,0 +1,124 @@
+# smart_applier/utils/llm_cache.py
+import os
+import json
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from smart_applier.utils.path_utils import get_data_dirs
+
+DEFAULT_TTL_HOURS = 24 * 7
+
+ResourceKey = Tuple[str, int]  # (skill, n_resources)
+
+
+class ResponseCache:
+    """LLM learning-resource answers keyed by (model, skill, n_resources), with a TTL."""
+
+    def __init__(self, path: Optional[Path] = None, ttl_seconds: Optional[float] = None):
+        if path is None:
+            path = get_data_dirs()["root"] / "llm_cache.db"
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("LLM_CACHE_TTL_HOURS", DEFAULT_TTL_HOURS)) * 3600
+
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS resources (
+                model TEXT NOT NULL,
+                skill TEXT NOT NULL,
+                n_resources INTEGER NOT NULL,
+                response_json TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (model, skill, n_resources)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_resources_created_at ON resources(created_at)")
+        self._conn.commit()
+
+    # -----------------------------
+    # Lookups
+    # -----------------------------
+    def get_many(self, model: str, keys: List[ResourceKey]) -> Dict[ResourceKey, List[str]]:
+        if not keys:
+            return {}
+
+        found: Dict[ResourceKey, List[str]] = {}
+        unique = list(dict.fromkeys(keys))
+        fresh_after = time.time() - self.ttl_seconds
+
+        with self._lock:
+            for skill, n_resources in unique:
+                row = self._conn.execute(
+                    "SELECT response_json FROM resources "
+                    "WHERE model=? AND skill=? AND n_resources=? AND created_at >= ?",
+                    (model, skill, n_resources, fresh_after),
+                ).fetchone()
+                if row:
+                    found[(skill, n_resources)] = json.loads(row[0])
+
+            self.hits += len(found)
+            self.misses += len(unique) - len(found)
+
+        return found
+
+    def put_many(self, model: str, items: Dict[ResourceKey, List[str]]):
+        if not items:
+            return
+
+        now = time.time()
+        rows = [
+            (model, skill, n_resources, json.dumps(resources), now)
+            for (skill, n_resources), resources in items.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO resources (model, skill, n_resources, response_json, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.execute("DELETE FROM resources WHERE created_at < ?", (now - self.ttl_seconds,))
+            self._conn.commit()
+
+    # -----------------------------
+    # Stats
+    # -----------------------------
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM resources").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+            "ttl_hours": round(self.ttl_seconds / 3600, 2),
+        }
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM resources")
+            self._conn.commit()
+
+
+# -----------------------------
+# Process-wide cache
+# -----------------------------
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
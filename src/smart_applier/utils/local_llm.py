@@ -0,0 +1,44 @@
+# smart_applier/utils/local_llm.py
+import re
+import time
+import hashlib
+from types import SimpleNamespace
+
+LOCAL_MODEL_NAME = "local-stub"
+
+_PROVIDERS = (
+    ("Coursera", "https://www.coursera.org/search?query={q}"),
+    ("YouTube", "https://www.youtube.com/results?search_query={q}+tutorial"),
+    ("Kaggle Learn", "https://www.kaggle.com/learn/search?q={q}"),
+    ("freeCodeCamp", "https://www.freecodecamp.org/news/search/?query={q}"),
+    ("edX", "https://www.edx.org/search?q={q}"),
+    ("MIT OpenCourseWare", "https://ocw.mit.edu/search/?q={q}"),
+)
+
+
+class LocalGenerativeModel:
+    """Deterministic offline stand-in for `genai.GenerativeModel` (LLM_BACKEND=local)."""
+
+    def __init__(self, model_name: str = LOCAL_MODEL_NAME, latency: float = 0.0):
+        self.model_name = model_name
+        self.latency = latency
+        self.calls = 0
+
+    def generate_content(self, prompt: str):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        n = re.search(r"List (\d+)", prompt)
+        skill = re.search(r"skill '([^']*)'", prompt)
+        n = int(n.group(1)) if n else 3
+        skill = skill.group(1) if skill else prompt.strip()
+
+        # same prompt → same providers, in the same order
+        start = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest(), 16) % len(_PROVIDERS)
+        query = "+".join(skill.split())
+        lines = []
+        for i in range(n):
+            name, url = _PROVIDERS[(start + i) % len(_PROVIDERS)]
+            lines.append(f"- {name}: {skill} - {url.format(q=query)}")
+        return SimpleNamespace(text="\n".join(lines))
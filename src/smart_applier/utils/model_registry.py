@@ -0,0 +1,124 @@
+# smart_applier/utils/model_registry.py
+import os
+import threading
+import time
+from typing import Dict, Iterable, Any, Optional
+
+from sentence_transformers import SentenceTransformer
+
+# the job matcher's model; callers add the skill-gap backends they use
+DEFAULT_MODELS = ("all-MiniLM-L6-v2",)
+
+# -----------------------------
+# Process-wide state
+# -----------------------------
+_models: Dict[str, SentenceTransformer] = {}
+_stats: Dict[str, Dict[str, Any]] = {}
+_locks: Dict[str, threading.Lock] = {}
+_registry_lock = threading.Lock()
+# one load at a time, so a model's RSS delta does not include another model
+_load_lock = threading.Lock()
+
+
+def _model_lock(model_name: str) -> threading.Lock:
+    with _registry_lock:
+        lock = _locks.get(model_name)
+        if lock is None:
+            lock = _locks[model_name] = threading.Lock()
+        return lock
+
+
+def _rss_mb() -> Optional[float]:
+    """Current resident memory (not the peak) from /proc; None where that is unavailable."""
+    try:
+        with open("/proc/self/statm") as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _param_mb(model: SentenceTransformer) -> float:
+    try:
+        total = sum(p.numel() * p.element_size() for p in model.parameters())
+        return total / (1024 * 1024)
+    except Exception:
+        return 0.0
+
+
+# -----------------------------
+# Public API
+# -----------------------------
+def get_model(model_name: str = "all-MiniLM-L6-v2") -> SentenceTransformer:
+    """
+    Return the shared SentenceTransformer for `model_name`, loading it once per process.
+    Safe to call from several threads (Streamlit sessions, graph nodes) at once.
+    """
+    model = _models.get(model_name)
+    if model is not None:
+        return model
+
+    with _model_lock(model_name):
+        # another thread may have finished loading while we waited
+        model = _models.get(model_name)
+        if model is not None:
+            return model
+
+        with _load_lock:
+            rss_before = _rss_mb()
+            start = time.perf_counter()
+            print(f" Loading embedding model '{model_name}'...")
+            model = SentenceTransformer(model_name)
+            load_seconds = time.perf_counter() - start
+            rss_after = _rss_mb()
+
+        # other allocations in the process during the load still count towards
+        # the delta; without /proc, report the parameter size instead
+        param_mb = _param_mb(model)
+        if rss_before is not None and rss_after is not None:
+            rss_delta, rss_source = max(rss_after - rss_before, 0.0), "statm"
+        else:
+            rss_delta, rss_source = param_mb, "params"
+
+        _stats[model_name] = {
+            "load_seconds": round(load_seconds, 3),
+            "param_mb": round(param_mb, 1),
+            "rss_delta_mb": round(rss_delta, 1),
+            "rss_source": rss_source,
+            "loaded_at": time.time(),
+        }
+        _models[model_name] = model
+        print(f" Model '{model_name}' ready in {load_seconds:.2f}s")
+        return model
+
+
+def preload_models(model_names: Iterable[str] = DEFAULT_MODELS, background: bool = False):
+    """
+    Warm the registry at startup. With background=True the load runs in a daemon
+    thread so the first page render is not blocked.
+    """
+    names = list(model_names)
+
+    def _load_all():
+        for name in names:
+            try:
+                get_model(name)
+            except Exception as e:
+                print(f" Failed to preload model '{name}': {e}")
+
+    if background:
+        thread = threading.Thread(target=_load_all, name="model-preload", daemon=True)
+        thread.start()
+        return thread
+
+    _load_all()
+    return None
+
+
+def is_loaded(model_name: str) -> bool:
+    return model_name in _models
+
+
+def model_stats() -> Dict[str, Dict[str, Any]]:
+    """Load time (s), parameter memory (MB) and current-RSS growth while loading (MB) per model."""
+    return {name: dict(stats) for name, stats in _stats.items()}
@@ -0,0 +1,120 @@
+# smart_applier/utils/skill_normalizer.py
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, Iterable, List
+
+# canonical skill → aliases (matched after text normalization, with and without spaces).
+# Only true synonyms: a role ("data analyst"), a product ("github") or a bare word
+# ("node", "rest") does not prove the skill.
+SKILL_ALIASES: Dict[str, List[str]] = {
+    "machine learning": ["ml", "machine-learning", "machinelearning"],
+    "deep learning": ["dl"],
+    "natural language processing": ["nlp"],
+    "large language models": ["llm", "llms", "large language model"],
+    "generative ai": ["genai", "gen ai", "generative artificial intelligence"],
+    "data analysis": ["data analytics"],
+    "data visualization": ["data visualisation", "dataviz", "data viz"],
+    "power bi": ["powerbi", "microsoft power bi", "ms power bi"],
+    "excel": ["ms excel", "microsoft excel", "advanced excel"],
+    "sql": ["structured query language"],
+    "postgresql": ["postgres", "postgre sql", "postgre"],
+    "mysql": ["my sql"],
+    "mongodb": ["mongo", "mongo db"],
+    "python": ["python3", "python 3"],
+    "javascript": ["js", "java script", "ecmascript"],
+    "typescript": ["ts"],
+    "node.js": ["nodejs", "node js"],
+    "react": ["reactjs", "react.js", "react js"],
+    "c++": ["cpp"],
+    "c#": ["csharp", "c sharp"],
+    ".net": ["dotnet", "dot net"],
+    "scikit-learn": ["sklearn", "scikit learn", "scikitlearn"],
+    "pytorch": ["torch"],
+    "tensorflow": ["tensor flow"],
+    "pandas": ["python pandas"],
+    "numpy": ["num py"],
+    "aws": ["amazon web services"],
+    "gcp": ["google cloud", "google cloud platform"],
+    "azure": ["microsoft azure", "ms azure"],
+    "kubernetes": ["k8s"],
+    "docker": ["docker containers"],
+    "ci/cd": ["cicd", "ci cd"],
+    "rest api": ["rest apis", "restful api", "restful apis"],
+    "git": ["git/github"],
+    "communication": ["communication skills", "verbal communication", "written communication"],
+    "problem solving": ["problem-solving", "problem solving skills"],
+}
+
+
+def normalize_skill_text(phrase: str) -> str:
+    """
+    Case/punctuation/whitespace normalization that keeps skill-bearing symbols:
+    "Machine-Learning." -> "machine learning", " C++ " -> "c++", "Node.JS" -> "node.js".
+    """
+    text = unicodedata.normalize("NFKC", str(phrase)).lower()
+    text = re.sub(r"[‐-―_]", "-", text)      # unicode dashes, underscores
+    text = re.sub(r"(?<=\w)-(?=\w)", " ", text)        # hyphenated words
+    text = re.sub(r"[^\w\s+#./]", " ", text)           # drop other punctuation
+    text = re.sub(r"(?<!\w)\.(?!net\b)|\.(?!\w)", " ", text)  # stray dots, except ".net" / "node.js"
+    return " ".join(text.split()).strip(" /")
+
+
+def _compact(text: str) -> str:
+    return text.replace(" ", "")
+
+
+@lru_cache(maxsize=1)
+def _alias_index() -> Dict[str, str]:
+    index = {}
+    for canonical, aliases in SKILL_ALIASES.items():
+        for name in [canonical, *aliases]:
+            key = normalize_skill_text(name)
+            index.setdefault(key, canonical)
+            index.setdefault(_compact(key), canonical)
+    return index
+
+
+@lru_cache(maxsize=65536)
+def canonical_skill(phrase: str) -> str:
+    """Canonical name for a skill phrase (exact / alias lookup, no model)."""
+    text = normalize_skill_text(phrase)
+    index = _alias_index()
+    return index.get(text) or index.get(_compact(text)) or text
+
+
+def skill_id(phrase: str) -> str:
+    """Stable identifier of the canonical skill, e.g. "machine_learning", "c++"."""
+    return re.sub(r"[^a-z0-9+#.]+", "_", canonical_skill(phrase)).strip("_")
+
+
+def normalize_skills(phrases: Iterable[str]) -> List[str]:
+    """Canonical names, deduplicated, first-seen order, empties dropped."""
+    seen = {}
+    for phrase in phrases:
+        canonical = canonical_skill(phrase)
+        if canonical:
+            seen.setdefault(canonical, None)
+    return list(seen)
+
+
+def split_skills(text) -> List[str]:
+    """Comma-separated skills text → canonical names (duplicates kept, for counting)."""
+    return [c for c in (canonical_skill(s) for s in str(text).split(",") if s.strip()) if c]
+
+
+def lexical_similarity(a: str, b: str) -> float:
+    """
+    Model-free similarity of two skill phrases in [0, 1]: 1.0 for the same
+    canonical skill, otherwise the better of token overlap (Jaccard) and
+    character-level fuzzy ratio ("tensorflow 2" ~ "tensorflow").
+    """
+    a, b = canonical_skill(a), canonical_skill(b)
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    tokens_a, tokens_b = set(a.split()), set(b.split())
+    jaccard = len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+    return max(jaccard, SequenceMatcher(None, a, b).ratio())
@@ -0,0 +1,182 @@
+# smart_applier/utils/skill_vocab.py
+import os
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from smart_applier.utils.path_utils import get_data_dirs
+
+try:
+    import fcntl  # POSIX: serialize appends from several processes
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+def _vocab_base(model_name: str) -> Path:
+    folder = get_data_dirs()["root"] / "skill_vocab"
+    folder.mkdir(parents=True, exist_ok=True)
+    return folder / f"skills_{model_name.replace('/', '_')}"
+
+
+class SkillVocabulary:
+    """
+    Persistent phrase → unit vector store for one model: an append-only
+    skills_<model>.f32 matrix plus a .jsonl phrase list (line i names row i).
+    """
+
+    def __init__(self, model_name: str, path: Optional[Path] = None):
+        base = Path(path) if path else _vocab_base(model_name)
+        self.model_name = model_name
+        self.vectors_path = base.with_suffix(".f32")
+        self.phrases_path = base.with_suffix(".jsonl")
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.RLock()
+        self._dim: Optional[int] = None
+        self._vectors = np.zeros((0, 0), dtype="float32")
+        self._index: Dict[str, int] = {}
+        self._loaded_size = -1
+        self._valid_bytes = 0  # phrases-file prefix made of whole lines backed by vectors
+
+    @staticmethod
+    def normalize(phrase: str) -> str:
+        return " ".join(str(phrase).lower().split())
+
+    # -----------------------------
+    # Loading / saving
+    # -----------------------------
+    def _refresh(self):
+        """(Re)load when another process or instance has appended."""
+        size = self.phrases_path.stat().st_size if self.phrases_path.exists() else 0
+        if size == self._loaded_size:
+            return
+        self._loaded_size = size
+        self._dim, self._vectors, self._index, self._valid_bytes = None, np.zeros((0, 0), "float32"), {}, 0
+        if not size:
+            return
+
+        with open(self.phrases_path, "rb") as fh:
+            data = fh.read()
+
+        # whole lines only: a torn trailing line (crash mid-append) is ignored
+        lines, ends, offset = [], [], 0
+        for raw in data.split(b"\n")[:-1]:
+            offset += len(raw) + 1
+            try:
+                lines.append(json.loads(raw))
+            except ValueError:
+                break
+            ends.append(offset)
+        if not lines:
+            return
+
+        dim = int(lines[0]["dim"])
+        phrases = lines[1:]
+        vectors = np.fromfile(self.vectors_path, dtype="float32") if self.vectors_path.exists() else np.zeros(0, "float32")
+        rows = min(len(phrases), vectors.size // dim)
+
+        self._dim = dim
+        self._vectors = vectors[: rows * dim].reshape(rows, dim)
+        self._index = {p: i for i, p in enumerate(phrases[:rows])}
+        self._valid_bytes = ends[rows]
+
+    def _append(self, phrases: List[str], vectors: np.ndarray):
+        self.phrases_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.phrases_path, "a+b") as fh:
+            if fcntl:
+                fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                self._loaded_size = -1
+                self._refresh()  # rows appended by others since our last read
+                fresh = [i for i, p in enumerate(phrases) if p not in self._index]
+                if not fresh:
+                    return
+
+                # cut any half-finished append so row i stays phrase line i
+                rows = len(self._index)
+                dim = self._dim or int(vectors.shape[1])
+                fh.truncate(self._valid_bytes)
+                if self.vectors_path.exists():
+                    os.truncate(self.vectors_path, rows * dim * 4)
+                if not self._valid_bytes:
+                    fh.write((json.dumps({"model": self.model_name, "dim": dim}) + "\n").encode("utf-8"))
+
+                with open(self.vectors_path, "ab") as vf:
+                    vectors[fresh].astype("float32").tofile(vf)  # vectors first, then their names
+                fh.write("".join(json.dumps(phrases[i]) + "\n" for i in fresh).encode("utf-8"))
+            finally:
+                fh.flush()
+                if fcntl:
+                    fcntl.flock(fh, fcntl.LOCK_UN)
+        self._loaded_size = -1
+        self._refresh()
+
+    # -----------------------------
+    # Lookups
+    # -----------------------------
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._index)
+
+    def __contains__(self, phrase: str) -> bool:
+        with self._lock:
+            self._refresh()
+            return self.normalize(phrase) in self._index
+
+    def vectors(self, phrases: Iterable[str], model=None) -> np.ndarray:
+        """
+        Unit vectors for `phrases` (normalized first), in input order.
+        Unknown phrases are encoded once with `model` (default: the shared
+        registry model) and added to the vocabulary.
+        """
+        keys = [self.normalize(p) for p in phrases]
+        with self._lock:
+            self._refresh()
+            missing = [k for k in dict.fromkeys(keys) if k not in self._index]
+            self.misses += len(missing)
+            self.hits += len(dict.fromkeys(keys)) - len(missing)
+
+            if missing:
+                if model is None:
+                    from smart_applier.utils.model_registry import get_model
+                    model = get_model(self.model_name)
+                encoded = model.encode(
+                    missing, batch_size=64,
+                    convert_to_numpy=True, normalize_embeddings=True,
+                ).astype("float32")
+                self._append(missing, encoded)
+
+            if not keys:
+                return np.zeros((0, self._dim or 0), dtype="float32")
+            return self._vectors[[self._index[k] for k in keys]]
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "model": self.model_name,
+            "phrases": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+# -----------------------------
+# One vocabulary per model per process
+# -----------------------------
+_vocabularies: Dict[str, SkillVocabulary] = {}
+_vocabularies_lock = threading.Lock()
+
+
+def get_skill_vocabulary(model_name: str = "all-MiniLM-L6-v2") -> SkillVocabulary:
+    with _vocabularies_lock:
+        vocab = _vocabularies.get(model_name)
+        if vocab is None:
+            vocab = _vocabularies[model_name] = SkillVocabulary(model_name)
+        return vocab
@@ -0,0 +1,15 @@
+# smart_applier/utils/sql_utils.py
+
+# stay well below SQLite's bound-parameter limit
+IN_CHUNK_SIZE = 500
+
+
+def select_in(conn, sql: str, values, params: tuple = (), chunk_size: int = IN_CHUNK_SIZE) -> list:
+    """Run `sql` (with an `IN ({marks})` slot after `params`) over distinct `values`, chunk by chunk."""
+    rows = []
+    unique = list(dict.fromkeys(values))
+    for start in range(0, len(unique), chunk_size):
+        chunk = unique[start:start + chunk_size]
+        marks = ",".join("?" * len(chunk))
+        rows.extend(conn.execute(sql.format(marks=marks), (*params, *chunk)).fetchall())
+    return rows
@@ -5,6 +5,7 @@ import pandas as pd
 
 from smart_applier.agents.profile_agent import UserProfileAgent
 from smart_applier.utils.db_utils import insert_resume
+from smart_applier.agents.skill_gap_agent import interactive_backend
 
 # LangGraph Workflows
 from smart_applier.langgraph.subworkflows import (
@@ -38,7 +39,10 @@ def run():
             with st.spinner("Running full AI pipeline… (Scrape → Match → Skills → Resume)"):
 
                 graph = build_job_scraper_workflow()
-                result = graph.invoke({"user_id": selected_user_id})
+                result = graph.invoke({
+                    "user_id": selected_user_id,
+                    "skill_gap_backend": interactive_backend(),
+                })
 
             st.success("Pipeline completed successfully!")
 
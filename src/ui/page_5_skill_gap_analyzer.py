@@ -3,6 +3,7 @@ import pandas as pd
 import traceback
 
 from smart_applier.agents.profile_agent import UserProfileAgent
+from smart_applier.agents.skill_gap_agent import interactive_backend
 from smart_applier.langgraph.subworkflows import build_skill_gap_graph
 
 
@@ -35,7 +36,10 @@ def run():
         try:
             with st.spinner("Computing skill gap…"):
                 graph = build_skill_gap_graph()
-                result = graph.invoke({"user_id": selected_user_id})
+                result = graph.invoke({
+                    "user_id": selected_user_id,
+                    "skill_gap_backend": interactive_backend(),
+                })
 
             recommendations = result.get("skill_gap_recommendations", {})
 
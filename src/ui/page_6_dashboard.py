@@ -1,14 +1,13 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import base64
 
 from smart_applier.utils.db_utils import (
     list_profiles,
     get_profile,
-    get_all_scraped_jobs,
-    get_latest_top_matched,
+    get_dashboard_stats,
     list_resumes,
+    count_resumes,
     get_resume_blob
 )
 
@@ -72,47 +71,53 @@ def run():
     # ======================================================
     st.subheader("Your Resumes")
 
-    resumes = list_resumes()
-
-    if resumes:
-
-        basic_resumes = [r for r in resumes if r["resume_type"] == "generated"]
-        tailored_matched = [r for r in resumes if r["resume_type"] == "tailored_matched_job"]
-        tailored_external = [r for r in resumes if r["resume_type"] == "tailored"]
-
-        colA, colB, colC = st.columns(3)
-
-        def render_resume_links(resume_list):
-            if not resume_list:
-                return "None"
-
-            html = ""
-            for r in resume_list:
-                blob = get_resume_blob(r["id"])
-                if blob:
-                    b64 = base64.b64encode(blob).decode()
-
-                    link = f"""
-                        <a href='data:application/pdf;base64,{b64}' 
-                           download='{r['file_name']}'
-                           style='color:#0066cc; text-decoration:none; font-size:15px;'>
-                           {r['file_name']}
-                        </a><br>
-                    """
-                    html += link
-            return html
-
-        with colA:
-            st.markdown("### Basic Resume")
-            st.markdown(render_resume_links(basic_resumes), unsafe_allow_html=True)
-
-        with colB:
-            st.markdown("### Tailored – Top Matched Job")
-            st.markdown(render_resume_links(tailored_matched), unsafe_allow_html=True)
-
-        with colC:
-            st.markdown("### Tailored – External JD")
-            st.markdown(render_resume_links(tailored_external), unsafe_allow_html=True)
+    RESUME_TYPES = {
+        "generated": "Basic Resume",
+        "tailored_matched_job": "Tailored – Top Matched Job",
+        "tailored": "Tailored – External JD",
+    }
+    PAGE_SIZE = 10
+
+    colF1, colF2 = st.columns(2)
+    with colF1:
+        user_ids = [p["user_id"] for p in profiles]
+        filter_user = st.selectbox("User", ["All users"] + user_ids, index=1, key="resume_filter_user")
+    with colF2:
+        filter_type = st.selectbox("Type", ["All types"] + list(RESUME_TYPES), key="resume_filter_type",
+                                   format_func=lambda t: RESUME_TYPES.get(t, t))
+
+    filters = {
+        "user_id": None if filter_user == "All users" else filter_user,
+        "resume_type": None if filter_type == "All types" else filter_type,
+    }
+    total = count_resumes(**filters)
+
+    if total:
+        n_pages = (total + PAGE_SIZE - 1) // PAGE_SIZE
+        page = st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1,
+                               key="resume_page") if n_pages > 1 else 1
+
+        # metadata only; a PDF is read from the DB when its download is requested
+        for r in list_resumes(limit=PAGE_SIZE, offset=(page - 1) * PAGE_SIZE, **filters):
+            pdf_key = f"resume_pdf_{r['id']}"
+            colN, colM, colD = st.columns([3, 2, 1])
+            colN.markdown(f"**{r['file_name']}**  \n{RESUME_TYPES.get(r['resume_type'], r['resume_type'])}")
+            colM.caption(f"{r['user_id']} · {r['created_at']} · {(r['size_bytes'] or 0) / 1024:.0f} KB")
+
+            with colD:
+                if pdf_key in st.session_state:
+                    st.download_button(
+                        label="Download",
+                        data=st.session_state[pdf_key],
+                        file_name=r["file_name"],
+                        mime="application/pdf",
+                        key=f"download_{r['id']}",
+                        on_click=st.session_state.pop,  # release the bytes once downloaded
+                        args=(pdf_key, None),
+                    )
+                elif st.button("Get PDF", key=f"fetch_{r['id']}"):
+                    st.session_state[pdf_key] = get_resume_blob(r["id"])
+                    st.rerun()
 
     else:
         st.info("No resumes generated yet.")
@@ -122,12 +127,17 @@ def run():
     # ======================================================
     # JOB STATS
     # ======================================================
-    scraped = get_all_scraped_jobs(limit=5000)
-    matched = get_latest_top_matched(limit=5000)
+    stats = get_dashboard_stats(recent=3)
+    per_user = {row["user_id"]: row["matches"] for row in stats["matches_per_user"]}
 
-    colA, colB = st.columns(2)
-    colA.metric("Total Scraped Jobs", len(scraped))
-    colB.metric("Matched Jobs", len(matched))
+    colA, colB, colC = st.columns(3)
+    colA.metric("Total Scraped Jobs", stats["total_jobs"])
+    colB.metric("Matched Jobs", stats["total_matches"])
+    colC.metric("Your Matches", per_user.get(user_id, 0))
+
+    if len(per_user) > 1:
+        with st.expander("Matches per user"):
+            st.dataframe(pd.DataFrame(stats["matches_per_user"]))
 
     st.divider()
 
@@ -135,8 +145,9 @@ def run():
     # RECENT MATCHED JOBS
     # ======================================================
     st.subheader("Latest Matched Jobs")
+    matched = stats["recent_matches"]
     if matched:
-        st.dataframe(pd.DataFrame(matched).head(3))
+        st.dataframe(pd.DataFrame(matched))
     else:
         st.info("No matched jobs yet.")
 
@@ -210,22 +221,30 @@ def run():
     st.subheader("🧹 Database Cleanup (Developer Tools)")
     st.caption("Warning: These actions cannot be undone.")
 
-    import sqlite3
-    from smart_applier.utils.path_utils import get_data_dirs
-
-    paths = get_data_dirs()
-    db_path = paths["db_path"]
+    from smart_applier.database import retention
+    from smart_applier.utils.job_index import reset_job_indexes
 
     def clear_table(table_name):
         try:
-            conn = sqlite3.connect(db_path)
-            conn.execute(f"DELETE FROM {table_name}")
-            conn.commit()
-            conn.close()
-            st.success(f"Cleared table: {table_name}")
+            # batched deletes: other sessions keep reading in between
+            deleted = retention.clear_table(table_name)
+            st.success(f"Cleared table: {table_name} ({deleted} rows)")
         except Exception as e:
             st.error(f"Error clearing {table_name}: {e}")
 
+    if st.button("Apply Retention Policy Now"):
+        try:
+            st.json(retention.run_maintenance(force=True))
+        except Exception as e:
+            st.error(f"Retention failed: {e}")
+
+    if st.button("Compact Database (full VACUUM)"):
+        try:
+            # rewrites the whole file and blocks other sessions while it runs
+            st.json(retention.vacuum(full=True))
+        except Exception as e:
+            st.error(f"Vacuum failed: {e}")
+
     col1, col2, col3 = st.columns(3)
 
     with col1:
@@ -238,6 +257,8 @@ def run():
     with col2:
         if st.button("Clear Scraped Jobs Table"):
             clear_table("scraped_jobs")
+            # job ids are gone, so every saved job index is stale
+            reset_job_indexes()
 
         if st.button("Clear Matched Jobs Table"):
             clear_table("top_matched_jobs")
@@ -246,3 +267,4 @@ def run():
         if st.button("Clear EVERYTHING"):
             for tbl in ["profiles", "resumes", "scraped_jobs", "top_matched_jobs"]:
                 clear_table(tbl)
+            reset_job_indexes()
@@ -3,6 +3,7 @@ import traceback
 import pandas as pd
 
 from smart_applier.agents.profile_agent import UserProfileAgent
+from smart_applier.agents.skill_gap_agent import interactive_backend
 from smart_applier.langgraph.workflow import build_master_workflow
 
 
@@ -54,7 +55,7 @@ def run():
     st.markdown("---")
 
     # Prepare dynamic input dict
-    input_data = {"user_id": user_id}
+    input_data = {"user_id": user_id, "skill_gap_backend": interactive_backend()}
 
     # ------------------------------------------------------
     # If workflow needs JD text
@@ -0,0 +1,56 @@
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture
+def data_root(tmp_path, monkeypatch):
+    """Point data/ (and so the SQLite DB) at a temp dir for one test."""
+    from smart_applier.utils import path_utils
+    from smart_applier.database.connection import reset_manager
+
+    (tmp_path / "data").mkdir()
+    monkeypatch.setattr(path_utils, "get_project_root", lambda: tmp_path)
+    monkeypatch.delenv("USE_IN_MEMORY_DB", raising=False)
+    reset_manager()
+    yield tmp_path / "data"
+    reset_manager()
+
+
+class _KarkidiHandler(BaseHTTPRequestHandler):
+    pages_dir = FIXTURES / "karkidi"
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        match = re.fullmatch(r"/Find-Jobs/(\d+)/all/India", self.path)
+        page = self.pages_dir / f"page_{match.group(1)}.html" if match else None
+        if page is None or not page.exists():
+            self.send_error(404)
+            return
+        body = page.read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def karkidi_server():
+    """Local stand-in for karkidi.com serving the saved pages in fixtures/karkidi."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KarkidiHandler)
+    server.requests = []
+    server.base_url = f"http://127.0.0.1:{server.server_port}/Find-Jobs/{{page}}/all/India"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
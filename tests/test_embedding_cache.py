@@ -0,0 +1,76 @@
+import numpy as np
+
+from smart_applier.utils import embedding_cache
+from smart_applier.utils.embedding_cache import EmbeddingCache, cached_encode, text_key
+
+
+class FakeModel:
+    """Encodes each text as a constant vector of its length."""
+
+    def __init__(self, dim=4):
+        self.dim = dim
+        self.encoded = []
+
+    def encode(self, texts, **kwargs):
+        self.encoded.extend(texts)
+        return np.array([[len(t)] * self.dim for t in texts], dtype="float32")
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+
+def _vec(value, dim=4):
+    return np.full(dim, value, dtype="float32")
+
+
+def test_hits_and_misses_count_distinct_keys(tmp_path):
+    cache = EmbeddingCache(tmp_path / "cache.db")
+    cache.put_many("m", {"a": _vec(1)})
+
+    found = cache.get_many("m", ["a", "a", "b", "b"])
+
+    assert list(found) == ["a"]
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.get_many("other-model", ["a"]) == {}
+
+
+def test_cached_encode_encodes_each_miss_once(tmp_path):
+    cache = EmbeddingCache(tmp_path / "cache.db")
+    model = FakeModel()
+
+    first = cached_encode(model, "m", ["aa", "b", "aa"], cache)
+    second = cached_encode(model, "m", ["b", "ccc"], cache)
+
+    assert model.encoded == ["aa", "b", "ccc"]
+    assert first[:, 0].tolist() == [2, 1, 2]
+    assert second[:, 0].tolist() == [1, 3]
+
+
+def test_evicts_least_recently_used(tmp_path, monkeypatch):
+    clock = iter(range(1, 100))
+    monkeypatch.setattr(embedding_cache.time, "time", lambda: next(clock))
+    row_bytes = _vec(0).nbytes
+    cache = EmbeddingCache(tmp_path / "cache.db", max_bytes=3 * row_bytes)
+
+    for key in ("a", "b", "c"):
+        cache.put_many("m", {key: _vec(1)})
+    cache.get_many("m", ["a"])  # a is now newer than b and c
+    cache.put_many("m", {"d": _vec(1)})
+
+    assert set(cache.get_many("m", ["a", "b", "c", "d"])) == {"a", "d"}
+    assert cache.evictions == 2
+    assert cache.stats()["entries"] == 2
+
+
+def test_size_is_tracked_across_replace_and_reopen(tmp_path):
+    path = tmp_path / "cache.db"
+    cache = EmbeddingCache(path)
+    cache.put_many("m", {text_key("x"): _vec(1), text_key("y"): _vec(2)})
+    cache.put_many("m", {text_key("x"): _vec(3, dim=8)})
+
+    expected = _vec(0).nbytes + _vec(0, dim=8).nbytes
+    assert cache._size == expected
+    assert EmbeddingCache(path)._size == expected
+
+    cache.clear()
+    assert cache.stats()["size_mb"] == 0
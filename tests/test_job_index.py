@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+
+faiss = pytest.importorskip("faiss")
+
+from smart_applier.utils.job_index import JobIndex, index_kind
+
+
+def _vectors(n, dim=16, seed=0):
+    return np.random.default_rng(seed).standard_normal((n, dim)).astype("float32")
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+def test_add_replaces_changed_vectors(tmp_path, index_type):
+    index = JobIndex("fake", index_type, path=tmp_path / "jobs.faiss")
+    vecs = _vectors(5)
+    assert index.add(range(1, 6), vecs) == 5
+    assert index.add(range(1, 6), vecs) == 0  # unchanged vectors are left alone
+
+    new = _vectors(1, seed=1)
+    assert index.add([3], new) == 1
+    assert index.ntotal == 5
+
+    scores, ids = index.search(new, top_k=1)
+    assert ids[0][0] == 3
+    assert scores[0][0] == pytest.approx(1.0, abs=1e-5)
+
+
+def test_bind_resets_index_from_another_database(tmp_path):
+    path = tmp_path / "jobs.faiss"
+    index = JobIndex("fake", path=path)
+    index.bind("db-a")
+    index.add([1, 2], _vectors(2))
+    index.flush()
+
+    same = JobIndex("fake", path=path)
+    assert same.bind("db-a") is False
+    assert same.ntotal == 2
+
+    other = JobIndex("fake", path=path)
+    assert other.bind("db-b") is True
+    assert other.ntotal == 0
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw", "ivfpq"])
+def test_remove_works_for_every_index_type(tmp_path, index_type):
+    index = JobIndex("fake", index_type, params={"pq_nbits": 4, "pq_m": 4}, path=tmp_path / "jobs.faiss")
+    n = 700  # enough to train a small IVF-PQ
+    index.add(range(1, n + 1), _vectors(n))
+
+    assert index.remove([2, 5, 99999]) == 2
+    assert index.ntotal == n - 2
+    assert not {2, 5} & set(index.ids().tolist())
+
+
+def test_search_params_are_per_call(tmp_path):
+    index = JobIndex("fake", "hnsw", path=tmp_path / "jobs.faiss")
+    index.add(range(1, 51), _vectors(50))
+    query = _vectors(1, seed=3)
+
+    wide = index.search(query, top_k=5, params={"ef_search": 256})
+    default = index.search(query, top_k=5)
+
+    assert index.params["ef_search"] == 64
+    assert wide[1].shape == default[1].shape == (1, 5)
+
+
+def test_changes_stay_in_memory_until_flush(tmp_path):
+    path = tmp_path / "jobs.faiss"
+    index = JobIndex("fake", path=path)
+    index.add(range(1, 4), _vectors(3))
+    assert index.ntotal == 3
+    assert not path.exists()
+
+    assert index.flush() is True
+    assert index.flush() is False
+    index.remove([1])
+    assert JobIndex("fake", path=path).ntotal == 3
+
+    index.flush()
+    assert JobIndex("fake", path=path).ntotal == 2
+
+
+def test_hnsw_removal_is_hidden_then_compacted(tmp_path):
+    path = tmp_path / "jobs.faiss"
+    index = JobIndex("fake", "hnsw", path=path)
+    vecs = _vectors(40)
+    index.add(range(1, 41), vecs)
+    index.flush()
+
+    index.remove([7])
+    index.flush()  # 1 of 40 removed: below the compaction threshold
+    reopened = JobIndex("fake", "hnsw", path=path)
+    assert reopened.ntotal == 39
+    assert 7 not in reopened.search(vecs[6], top_k=39)[1][0]
+
+    # a removed id that comes back is live again
+    index.add([7], vecs[6:7])
+    assert index.search(vecs[6], top_k=1)[1][0][0] == 7
+
+    index.remove(range(1, 11))
+    index.flush()
+    assert index._deleted == set()
+    assert index._writer.ntotal == 30
+
+
+def test_ivfpq_is_trained_once_enough_jobs_arrive(tmp_path):
+    path = tmp_path / "jobs.faiss"
+    params = {"pq_nbits": 4, "pq_m": 4}  # needs 39 * 16 = 624 training vectors
+    index = JobIndex("fake", "ivfpq", params=params, path=path)
+    vecs = _vectors(700)
+
+    for start in range(0, 700, 20):  # one scraped page at a time
+        index.add(range(start + 1, start + 21), vecs[start:start + 20])
+        if start == 600:
+            assert index_kind(index._writer) == "flat"
+    index.flush()
+
+    reopened = JobIndex("fake", "ivfpq", params=params, path=path)
+    assert reopened.ntotal == 700
+    assert index_kind(reopened._searchable()) == "ivfpq"
+    assert sorted(reopened.ids().tolist()) == list(range(1, 701))
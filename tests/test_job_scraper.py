@@ -0,0 +1,58 @@
+import pytest
+
+from smart_applier.agents.job_scraper_agent import JobScraperAgent
+from smart_applier.utils.db_utils import bulk_insert_scraped_jobs, count_scraped_jobs
+
+
+def _agent(server, **kwargs):
+    return JobScraperAgent(base_url=server.base_url, requests_per_second=0, max_retries=0, **kwargs)
+
+
+def test_scrape_stream_against_fixture_server(data_root, karkidi_server):
+    batches = []
+    df = _agent(karkidi_server).scrape_stream(pages=4, on_batch=batches.append, stop_on_known_page=False)
+
+    assert len(df) == 8  # 3 + 3 + 2 jobs, page 4 is a 404
+    assert len(batches) == 3
+    assert df["title"].iloc[0] == "Data Analyst"  # ordered by page
+    assert df["db_id"].is_unique and df["is_new"].all()
+    assert set(df["source"]) == {"karkidi"}
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_rescrape_stops_at_first_known_page(data_root, karkidi_server, concurrent):
+    _agent(karkidi_server).scrape_stream(pages=3, stop_on_known_page=False)
+    karkidi_server.requests.clear()
+
+    df = _agent(karkidi_server, max_workers=4).scrape_stream(pages=3, concurrent=concurrent)
+
+    assert not df["is_new"].any()
+    assert karkidi_server.requests == ["/Find-Jobs/1/all/India"]
+
+
+def test_repeated_postings_are_streamed_once(data_root, karkidi_server):
+    agent = _agent(karkidi_server)
+    parse = agent.source.parse
+    agent.source.parse = lambda content: parse(content) * 2  # every posting listed twice
+
+    df = agent.scrape_stream(pages=2, stop_on_known_page=False)
+
+    assert len(df) == 6 and df["db_id"].is_unique and df["is_new"].all()
+    assert count_scraped_jobs() == 6
+
+
+def test_bulk_insert_returns_one_id_per_posting(data_root):
+    job = {"title": "Data Analyst", "company": "Acme", "skills": "SQL"}
+    other = {"title": "Data Engineer", "company": "Acme", "skills": "Spark"}
+
+    ids = bulk_insert_scraped_jobs([job, dict(job), other])
+
+    assert ids[0] == ids[1] != ids[2]
+    assert count_scraped_jobs() == 2
+
+
+def test_scrape_sources_uses_configured_source(data_root, karkidi_server):
+    df, report = _agent(karkidi_server).scrape_sources(["karkidi"], pages=2)
+
+    assert len(df) == 6
+    assert report["karkidi"]["requests"] == 2 and report["karkidi"]["errors"] == 0
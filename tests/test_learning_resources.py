@@ -0,0 +1,51 @@
+import time
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("google.generativeai")
+pytest.importorskip("sentence_transformers")
+
+from smart_applier.agents.skill_gap_agent import SkillGapAgent
+from smart_applier.utils.llm_cache import ResponseCache
+
+LATENCY = 0.2
+
+
+@pytest.fixture
+def agent(data_root, tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_BACKEND", "local")
+    monkeypatch.setenv("LOCAL_LLM_LATENCY", str(LATENCY))
+    profile = {"skills": {"technical": ["Python", "SQL"]}}
+    jobs = pd.DataFrame({"skills": ["docker, kubernetes, aws, react, excel"]})
+    agent = SkillGapAgent(profile, jobs, backend="lexical")
+    agent.response_cache = ResponseCache(tmp_path / "llm_cache.db")
+    agent.llm_max_workers = 8
+    return agent
+
+
+def test_misses_cost_about_one_call_and_hits_nothing(agent):
+    skills = ["docker", "kubernetes", "aws", "react", "excel"]
+
+    start = time.perf_counter()
+    cold = agent.get_learning_resources_many(skills)
+    cold_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    warm = agent.get_learning_resources_many(skills)
+    warm_s = time.perf_counter() - start
+
+    assert cold == warm and all(len(r) == 3 for r in cold.values())
+    assert cold_s < 2 * LATENCY  # concurrent, unpaced: not 5 sequential calls
+    assert warm_s < 0.05
+    assert agent.response_cache.stats()["entries"] == 5
+
+
+def test_aliases_share_one_lookup(agent):
+    resources = agent.get_learning_resources_many(["ML", "machine learning", "Machine-Learning"])
+
+    assert len({tuple(r) for r in resources.values()}) == 1
+    assert "machine learning" in resources["ML"][0]
+    stats = agent.response_cache.stats()
+    assert stats["misses"] == 1 and stats["entries"] == 1
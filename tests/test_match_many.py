@@ -0,0 +1,85 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("faiss")
+pytest.importorskip("sentence_transformers")
+
+from smart_applier.agents import job_matching_agent
+from smart_applier.agents.job_matching_agent import JobMatchingAgent
+from smart_applier.utils.db_utils import (
+    bulk_insert_scraped_jobs,
+    get_latest_top_matched,
+    insert_or_update_profile,
+)
+from smart_applier.utils.embedding_cache import EmbeddingCache
+from smart_applier.utils.job_index import JobIndex
+
+JOBS = [
+    {"title": "Data Analyst", "skills": "sql, power bi, excel"},
+    {"title": "ML Engineer", "skills": "python, pytorch, docker"},
+    {"title": "Backend Developer", "skills": "java, spring, kubernetes"},
+]
+
+
+class FakeModel:
+    """Deterministic vectors per text."""
+
+    def encode(self, texts, **kwargs):
+        rows = []
+        for text in texts:
+            seed = int(hashlib.sha256(text.encode()).hexdigest()[:8], 16)
+            rows.append(np.random.default_rng(seed).standard_normal(16))
+        return np.array(rows, dtype="float32")
+
+    def get_sentence_embedding_dimension(self):
+        return 16
+
+
+@pytest.fixture
+def matcher(data_root, tmp_path, monkeypatch):
+    monkeypatch.setattr(job_matching_agent, "get_model", lambda name: FakeModel())
+    agent = JobMatchingAgent(model_name="fake")
+    agent.embedding_cache = EmbeddingCache(tmp_path / "embeddings.db")
+    agent.job_index = JobIndex("fake", path=tmp_path / "jobs.faiss")
+
+    ids = bulk_insert_scraped_jobs(JOBS)
+    jobs = pd.DataFrame(JOBS).assign(db_id=ids)
+    agent.index_jobs(jobs, agent.embed_jobs(jobs))
+
+    insert_or_update_profile("alice", {"skills": {"technical": ["Python", "SQL"]}})
+    insert_or_update_profile("bob", {"skills": {"technical": ["Java"]}})
+    return agent
+
+
+def _stored():
+    return {(r["user_id"], r["job_id"]): r["score"] for r in get_latest_top_matched()}
+
+
+def test_match_many_dedupes_users_and_saves_once(matcher, monkeypatch):
+    writes = []
+    real_insert = job_matching_agent.bulk_insert_top_matched
+    monkeypatch.setattr(job_matching_agent, "bulk_insert_top_matched",
+                        lambda rows: writes.append(rows) or real_insert(rows))
+
+    results = matcher.match_many(["alice", "ghost", "bob", "alice"], top_k=2)
+
+    assert list(results) == ["alice", "bob"]
+    assert all(len(df) == 2 for df in results.values())
+    assert len(writes) == 1 and len(writes[0]) == 4
+    assert len(_stored()) == 4
+
+
+def test_every_path_stores_the_same_raw_score(matcher):
+    profile = {"skills": {"technical": ["Python", "SQL"]}}
+    shown = matcher.match_job_history(matcher.embed_user_profile(profile), top_k=3, user_id="history")
+    from_history = {job_id: score for (user, job_id), score in _stored().items() if user == "history"}
+
+    matcher.match_many(["alice"], top_k=3)
+    from_batch = {job_id: score for (user, job_id), score in _stored().items() if user == "alice"}
+
+    assert from_history == pytest.approx(from_batch, abs=1e-6)
+    assert any(score != round(score, 4) for score in from_batch.values())
+    assert shown["match_score"].tolist() == [round(from_history[j], 4) for j in shown["db_id"]]
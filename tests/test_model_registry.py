@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+pytest.importorskip("sentence_transformers")
+
+from smart_applier.utils import model_registry
+
+
+class BigModel:
+    """Holds ~64 MB of touched memory, like a model's weights."""
+
+    def __init__(self, name):
+        self.weights = bytearray(os.urandom(1024)) * (64 * 1024)
+
+    def parameters(self):
+        return []
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="needs /proc")
+def test_rss_delta_counts_current_memory_after_an_earlier_peak(monkeypatch):
+    monkeypatch.setattr(model_registry, "SentenceTransformer", BigModel)
+    monkeypatch.setattr(model_registry, "_models", {})
+    monkeypatch.setattr(model_registry, "_stats", {})
+
+    peak = bytearray(os.urandom(1024)) * (128 * 1024)  # raise the peak, then drop it
+    del peak
+
+    model_registry.get_model("big")
+    stats = model_registry.model_stats()["big"]
+
+    assert stats["rss_source"] == "statm"
+    assert stats["rss_delta_mb"] >= 48
@@ -0,0 +1,43 @@
+import sqlite3
+
+from smart_applier.database import retention
+from smart_applier.database.connection import get_manager
+
+
+def _auto_vacuum(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+
+
+def test_new_database_uses_incremental_vacuum(data_root):
+    report = retention.run_maintenance(force=True)
+
+    assert report["vacuum"]["mode"] == "incremental"
+    assert _auto_vacuum(data_root / "smart_applier.db") == 2
+
+
+def test_existing_database_is_only_converted_on_request(data_root):
+    db_path = data_root / "smart_applier.db"
+    with sqlite3.connect(db_path) as conn:  # created before incremental mode existed
+        conn.execute("CREATE TABLE legacy (x)")
+
+    report = retention.run_maintenance(force=True)
+    assert report["vacuum"]["mode"] == "skipped"
+    assert _auto_vacuum(db_path) == 0
+
+    assert retention.vacuum(full=True)["mode"] == "full"
+    get_manager().close()
+    assert _auto_vacuum(db_path) == 2
+
+
+def test_pruned_ids_are_reported_per_batch(data_root):
+    from smart_applier.utils.db_utils import bulk_insert_scraped_jobs
+
+    ids = bulk_insert_scraped_jobs([{"title": f"job {i}"} for i in range(5)])
+    seen = []
+
+    report = retention.prune_table("scraped_jobs", {"max_rows": 2}, batch_size=2,
+                                   on_delete=lambda table, batch: seen.append((table, batch)))
+
+    assert report["deleted"] == 3
+    assert seen == [("scraped_jobs", ids[:2]), ("scraped_jobs", ids[2:3])]
@@ -0,0 +1,21 @@
+from smart_applier.utils.db_utils import bulk_insert_scraped_jobs, search_jobs
+
+JOBS = [
+    {"title": "Data Analyst", "company": "Acme", "location": "Pune", "skills": "SQL, Power BI"},
+    {"title": "C++ Developer", "company": "Beta", "location": "Pune", "skills": "C++, Linux"},
+]
+
+
+def test_keyword_search_and_filters(data_root):
+    bulk_insert_scraped_jobs(JOBS)
+
+    assert [r["title"] for r in search_jobs("analyst")] == ["Data Analyst"]
+    assert [r["title"] for r in search_jobs("c++ linux")] == ["C++ Developer"]
+    assert [r["title"] for r in search_jobs(None, {"company": "beta"})] == ["C++ Developer"]
+
+
+def test_query_without_words_matches_nothing(data_root):
+    bulk_insert_scraped_jobs(JOBS)
+
+    assert search_jobs("!!! ++", {"location": "Pune"}) == []
+    assert len(search_jobs("   ", {"location": "Pune"})) == 2  # blank = no query
@@ -0,0 +1,20 @@
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("google.generativeai")
+pytest.importorskip("sentence_transformers")
+
+from smart_applier.agents.skill_gap_agent import backend_models, default_backend, interactive_backend
+
+
+def test_interactive_runs_skip_mpnet_by_default(monkeypatch):
+    monkeypatch.delenv("SKILL_GAP_BACKEND", raising=False)
+    monkeypatch.delenv("SKILL_GAP_INTERACTIVE_BACKEND", raising=False)
+
+    assert default_backend() == "mpnet"
+    assert backend_models(interactive_backend()) == ["all-MiniLM-L6-v2"]
+
+
+def test_backend_models_dedupes_and_ignores_lexical():
+    assert backend_models("minilm", "lexical", "minilm") == ["all-MiniLM-L6-v2"]
+    assert backend_models("lexical") == []
@@ -0,0 +1,25 @@
+import pytest
+
+from smart_applier.utils.skill_normalizer import canonical_skill, normalize_skills, skill_id
+
+
+@pytest.mark.parametrize("phrase, expected", [
+    ("Machine-Learning.", "machine learning"),
+    ("ML", "machine learning"),
+    ("PowerBI", "power bi"),
+    ("k8s", "kubernetes"),
+    ("NodeJS", "node.js"),
+    ("C++", "c++"),
+])
+def test_aliases_map_to_canonical_names(phrase, expected):
+    assert canonical_skill(phrase) == expected
+
+
+@pytest.mark.parametrize("phrase", ["github", "node", "rest", "data analyst", "continuous integration", "ai"])
+def test_broad_words_are_not_aliases(phrase):
+    assert canonical_skill(phrase) == phrase
+
+
+def test_normalize_skills_dedupes_and_ids_are_stable():
+    assert normalize_skills(["ML", "machine learning", " SQL ", ""]) == ["machine learning", "sql"]
+    assert skill_id("Machine-Learning") == "machine_learning"
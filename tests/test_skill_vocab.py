@@ -0,0 +1,60 @@
+import hashlib
+import json
+
+import numpy as np
+
+from smart_applier.utils.skill_vocab import SkillVocabulary
+
+
+class FakeModel:
+    """Deterministic unit vectors per phrase."""
+
+    def __init__(self, dim=8):
+        self.dim = dim
+        self.calls = 0
+
+    def encode(self, texts, **kwargs):
+        self.calls += 1
+        rows = []
+        for text in texts:
+            seed = int(hashlib.sha256(text.encode()).hexdigest()[:8], 16)
+            vec = np.random.default_rng(seed).standard_normal(self.dim).astype("float32")
+            rows.append(vec / np.linalg.norm(vec))
+        return np.array(rows)
+
+
+def test_vectors_persist_across_instances(tmp_path):
+    model = FakeModel()
+    vocab = SkillVocabulary("fake", tmp_path / "skills")
+    first = vocab.vectors(["Python", "sql", "python"], model)
+
+    again = SkillVocabulary("fake", tmp_path / "skills").vectors(["python", "sql"], model)
+
+    assert model.calls == 1
+    assert np.allclose(first[[0, 1]], again)
+
+
+def test_half_finished_append_is_repaired(tmp_path):
+    model = FakeModel()
+    base = tmp_path / "skills"
+    SkillVocabulary("fake", base).vectors(["python", "sql"], model)
+
+    # crash between the two writes: vector rows landed, phrase lines did not (one torn)
+    with open(base.with_suffix(".f32"), "ab") as vf:
+        model.encode(["docker", "aws"]).astype("float32").tofile(vf)
+    with open(base.with_suffix(".jsonl"), "a", encoding="utf-8") as fh:
+        fh.write(json.dumps("docker") + "\n" + '"aw')
+
+    vocab = SkillVocabulary("fake", base)
+    assert len(vocab) == 3  # "docker" is complete; the torn "aws" line is ignored instead of raising
+    assert "aws" not in vocab
+
+    new = vocab.vectors(["kubernetes", "python"], model)
+    expected = model.encode(["kubernetes", "python"])
+    assert np.allclose(new, expected)
+
+    reloaded = SkillVocabulary("fake", base)
+    phrases = ["python", "sql", "docker", "kubernetes"]
+    assert len(reloaded) == 4
+    assert np.allclose(reloaded.vectors(phrases), model.encode(phrases))
+    assert base.with_suffix(".f32").stat().st_size == 4 * model.dim * 4